@@ -0,0 +1,45 @@
+import os
+import sys
+import json
+import argparse
+import logging
+from core.constants import *
+from core.benchmark import Benchmark, load_labels, labelled_images, parse_video, compare_reports, format_report
+
+PROCESSED_DATASET_DIR = os.path.join(DATA_DIR, "processed_dataset")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded videos or the face dataset through the recognition pipeline and report latency and accuracy.")
+    parser.add_argument("--images", action="append", default=[], help="Folder of <PRN>/<image> subfolders to replay (repeatable; default: dataset and processed_dataset)")
+    parser.add_argument("--video", action="append", default=[], help="Video file to replay, optionally as clip.mp4=PRN1,PRN2 naming who appears in it (repeatable)")
+    parser.add_argument("--limit", type=int, default=0, help="Use at most this many images (0 = all)")
+    parser.add_argument("--no-gate", action="store_true", help="Run detection on every video frame instead of using the motion gate")
+    parser.add_argument("--json", help="Write the machine-readable report to this file")
+    parser.add_argument("--baseline", help="Earlier --json report to compare against; exits with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression against --baseline (default: 0.10)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    benchmark = Benchmark()
+    folders = args.images or ([] if args.video else [d for d in (FACE_DATASET_DIR, PROCESSED_DATASET_DIR) if os.path.isdir(d)])
+    if folders:
+        items = labelled_images(folders, load_labels())
+        benchmark.run_images(items[:args.limit] if args.limit else items)
+    for spec in args.video:
+        path, expected = parse_video(spec)
+        benchmark.run_video(path, expected, gate=not args.no_gate)
+    report = benchmark.report()
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare_reports(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
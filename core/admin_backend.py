@@ -3,8 +3,14 @@ import shutil
 import bcrypt
 import logging
 from datetime import datetime
-from .utils import read_csv, write_csv, append_csv, normalize
+from .utils import read_csv, write_csv, append_csv, normalize, copy_tree
 from .constants import *
+from . import repository
+from .dataset_index import schedule_rebuild
+from .attendance_store import get_store
+from .attendance_archive import archived_session_rows
+from .timetable import reload_timetable
+from .paging import CsvFileSource, SessionSource
 
 def log_action(action, detail=""):
     append_csv(LOGS_CSV, {
@@ -13,85 +19,122 @@ def log_action(action, detail=""):
         "Detail": detail
     }, ["Timestamp", "Action", "Detail"])
 
+_logs_source = CsvFileSource(LOGS_CSV, ["Timestamp", "Action", "Detail"])
+
 class AdminBackend:
     @staticmethod
     def get_users():
-        return read_csv(USERS_CSV, ["username", "password", "role"])
+        return repository.users.all()
+
+    @staticmethod
+    def count_users():
+        return repository.users.count()
+
+    @staticmethod
+    def get_user(username):
+        return repository.users.get(username)
 
     @staticmethod
     def add_user(username, password, role):
-        users = AdminBackend.get_users()
-        if any(u["username"] == username for u in users):
+        if repository.users.get(username):
             return False, "Username already exists."
         hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-        append_csv(USERS_CSV, {"username": username, "password": hashed.decode('utf-8'), "role": role}, ["username", "password", "role"])
+        repository.users.append({"username": username, "password": hashed.decode('utf-8'), "role": role})
         log_action("Add User", f"{username} ({role})")
         return True, "User added."
 
     @staticmethod
     def remove_user(username):
-        users = AdminBackend.get_users()
-        users = [u for u in users if u["username"] != username]
-        write_csv(USERS_CSV, users, ["username", "password", "role"])
+        repository.users.delete(username)
         log_action("Remove User", username)
         return True
 
     @staticmethod
     def reset_password(username, new_password):
-        users = AdminBackend.get_users()
-        for u in users:
-            if u["username"] == username:
-                u["password"] = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        write_csv(USERS_CSV, users, ["username", "password", "role"])
+        hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        repository.users.update(username, {"password": hashed})
         log_action("Reset Password", username)
         return True
 
     @staticmethod
     def get_students():
-        return read_csv(STUDENTS_CSV, ["PRN", "Name", "Class", "Division", "Batch"])
+        return repository.students.all()
+
+    @staticmethod
+    def count_students():
+        return repository.students.count()
+
+    @staticmethod
+    def get_student(prn):
+        return repository.students.get(prn)
 
     @staticmethod
     def add_student(student):
-        append_csv(STUDENTS_CSV, student, ["PRN", "Name", "Class", "Division", "Batch"])
+        repository.students.append(student)
         log_action("Add Student", student["PRN"])
         return True
 
+    @staticmethod
+    def update_student(student):
+        repository.students.put(student)
+        log_action("Edit Student", student["PRN"])
+        return True
+
+    @staticmethod
+    def import_students(rows):
+        new_rows = []
+        seen = set()
+        for row in rows:
+            if row["PRN"] in seen or repository.students.get(row["PRN"]):
+                continue
+            seen.add(row["PRN"])
+            new_rows.append(row)
+        repository.students.extend(new_rows)
+        log_action("Import Students", f"{len(new_rows)} new")
+        return len(new_rows)
+
     @staticmethod
     def remove_student(student_prn):
-        students = AdminBackend.get_students()
-        students = [s for s in students if s["PRN"] != student_prn]
-        write_csv(STUDENTS_CSV, students, ["PRN", "Name", "Class", "Division", "Batch"])
+        repository.students.delete(student_prn)
         log_action("Remove Student", student_prn)
         return True
 
     @staticmethod
     def get_attendance_files():
-        return [f for f in os.listdir(ATTENDANCE_DIR) if f.endswith(".csv")]
+        return get_store().sessions()
+
+    @staticmethod
+    def read_attendance(session):
+        if get_store().is_archived(session):
+            return archived_session_rows(session)
+        return get_store().session_rows(session)
 
     @staticmethod
-    def read_attendance(file):
-        return read_csv(os.path.join(ATTENDANCE_DIR, file))
+    def attendance_source(session):
+        return SessionSource(session)
 
     @staticmethod
-    def export_attendance(file, export_path):
-        shutil.copy(os.path.join(ATTENDANCE_DIR, file), export_path)
-        log_action("Export Attendance", file)
+    def export_attendance(session, export_path):
+        write_csv(export_path, AdminBackend.read_attendance(session), ATTENDANCE_HEADERS)
+        log_action("Export Attendance", session)
 
     @staticmethod
     def get_face_folders():
         return [name for name in os.listdir(FACE_DATASET_DIR) if os.path.isdir(os.path.join(FACE_DATASET_DIR, name))]
 
     @staticmethod
-    def add_face_folder(folder_path):
+    def add_face_folder(folder_path, rebuild=True, progress=None, cancelled=None):
         if not os.path.isdir(folder_path):
             return False, "Selected path is not a folder."
         folder_name = os.path.basename(folder_path.rstrip(os.sep))
         dest_path = os.path.join(FACE_DATASET_DIR, folder_name)
         if os.path.exists(dest_path):
             return False, "Folder already exists for this student."
-        shutil.copytree(folder_path, dest_path)
+        if not copy_tree(folder_path, dest_path, progress, cancelled):
+            return False, "Cancelled."
         log_action("Add Face Folder", folder_name)
-        # retrain_model() # Add your model retrain logic here if needed
+        if rebuild:
+            schedule_rebuild()
         # update_labels_csv()
         return True, "Face folder added."
 
@@ -101,7 +144,7 @@ class AdminBackend:
         if os.path.exists(dest_path) and os.path.isdir(dest_path):
             shutil.rmtree(dest_path)
             log_action("Remove Face Folder", student_folder_name)
-            # retrain_model()
+            schedule_rebuild()
             # update_labels_csv()
             return True
         return False
@@ -114,7 +157,7 @@ class AdminBackend:
             return False, "Invalid folder name or new name already exists."
         os.rename(old_path, new_path)
         log_action("Rename Face Folder", f"{old_name} -> {new_name}")
-        # retrain_model()
+        schedule_rebuild()
         # update_labels_csv()
         return True, "Face folder renamed."
 
@@ -127,6 +170,7 @@ class AdminBackend:
         fname = os.path.basename(src_path)
         dest_path = os.path.join(TIMETABLE_DIR, fname)
         shutil.copy(src_path, dest_path)
+        reload_timetable()
         log_action("Add Timetable CSV", fname)
         return True
 
@@ -135,6 +179,7 @@ class AdminBackend:
         path = os.path.join(TIMETABLE_DIR, fname)
         if os.path.exists(path):
             os.remove(path)
+            reload_timetable()
             log_action("Remove Timetable CSV", fname)
             return True
         return False
@@ -145,18 +190,16 @@ class AdminBackend:
 
     @staticmethod
     def get_settings():
-        return read_csv(SETTINGS_CSV, ["key", "value"])
+        return repository.settings.all()
+
+    @staticmethod
+    def get_setting(key, default=None):
+        row = repository.settings.get(key)
+        return row["value"] if row and row["value"] != "" else default
 
     @staticmethod
     def set_setting(key, value):
-        settings = AdminBackend.get_settings()
-        for s in settings:
-            if s["key"] == key:
-                s["value"] = value
-                break
-        else:
-            settings.append({"key": key, "value": value})
-        write_csv(SETTINGS_CSV, settings, ["key", "value"])
+        repository.settings.put({"key": key, "value": value})
         log_action("Set Setting", f"{key}={value}")
 
     @staticmethod
@@ -175,6 +218,10 @@ class AdminBackend:
     def get_logs():
         return read_csv(LOGS_CSV, ["Timestamp", "Action", "Detail"])
 
+    @staticmethod
+    def logs_source():
+        return _logs_source
+
     @staticmethod
     def write_csv(filepath, rows, headers):
         write_csv(filepath, rows, headers)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from .constants import *
+from .attendance_store import COLUMNS, HEADER_COLUMNS, get_store
+
+ARCHIVE_COLUMNS = ["session"] + COLUMNS + ["month"]
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.compute
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        logging.error("pyarrow is not installed; the attendance archive is unavailable")
+        return None
+
+def archive_after_days():
+    from .admin_backend import AdminBackend
+    try:
+        return int(AdminBackend.get_setting("archive_after_days", "30"))
+    except ValueError:
+        return 30
+
+def archive_session(name, archive_dir=ATTENDANCE_ARCHIVE_DIR, store=None):
+    pa = _pyarrow()
+    if pa is None:
+        return 0
+    store = store or get_store()
+    records = store.session_rows(name)
+    if records:
+        rows = []
+        for record in records:
+            row = {column: record.get(header, "") for header, column in HEADER_COLUMNS.items()}
+            row["session"] = name
+            row["month"] = row["date"][:7] or None
+            row["division"] = row["division"] or None
+            rows.append(row)
+        table = pa.Table.from_pylist(rows, schema=pa.schema([(c, pa.string()) for c in ARCHIVE_COLUMNS]))
+        # One file per session and partition, so re-archiving after a crash overwrites instead of duplicating.
+        pa.parquet.write_to_dataset(
+            table, root_path=archive_dir, partition_cols=["month", "division"],
+            basename_template=f"{name}-{{i}}.parquet", existing_data_behavior="overwrite_or_ignore"
+        )
+    store.mark_archived(name)
+    return len(records)
+
+def archive_closed_sessions(older_than_days=None, archive_dir=ATTENDANCE_ARCHIVE_DIR):
+    if _pyarrow() is None:
+        return 0
+    from .admin_backend import log_action
+    store = get_store()
+    days = archive_after_days() if older_than_days is None else older_than_days
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat(sep=" ", timespec="seconds")
+    archived = rows = 0
+    for name in store.closed_sessions(cutoff):
+        try:
+            rows += archive_session(name, archive_dir, store)
+            archived += 1
+        except Exception as e:
+            logging.error(f"Error archiving session {name}: {e}")
+    if archived:
+        log_action("Archive Attendance", f"{archived} sessions, {rows} rows")
+    return archived
+
+def _dataset(archive_dir):
+    pa = _pyarrow()
+    if pa is None or not os.path.isdir(archive_dir) or not os.listdir(archive_dir):
+        return None
+    partitioning = pa.dataset.partitioning(pa.schema([("month", pa.string()), ("division", pa.string())]), flavor="hive")
+    return pa.dataset.dataset(archive_dir, format="parquet", partitioning=partitioning)
+
+def _filter(subject=None, from_date=None, to_date=None, prn=None, division=None, session=None):
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    clauses = []
+    # month is a partition column, so range checks on it prune whole directories before any file is read.
+    if from_date:
+        clauses += [ds.field("month") >= from_date[:7], ds.field("date") >= from_date]
+    if to_date:
+        clauses += [ds.field("month") <= to_date[:7], ds.field("date") <= to_date]
+    if division:
+        clauses.append(ds.field("division") == division)
+    if prn:
+        clauses.append(ds.field("prn") == prn)
+    if session:
+        clauses.append(ds.field("session") == session)
+    if subject:
+        clauses.append(pc.match_substring(ds.field("subject"), subject, ignore_case=True))
+    expr = None
+    for clause in clauses:
+        expr = clause if expr is None else expr & clause
+    return expr
+
+def iter_archive_rows(subject=None, from_date=None, to_date=None, prn=None, division=None, session=None, archive_dir=ATTENDANCE_ARCHIVE_DIR):
+    dataset = _dataset(archive_dir)
+    if dataset is None:
+        return
+    scanner = dataset.scanner(columns=COLUMNS, filter=_filter(subject, from_date, to_date, prn, division, session))
+    for batch in scanner.to_batches():
+        for row in batch.to_pylist():
+            yield {header: row[column] or "" for header, column in HEADER_COLUMNS.items()}
+
+def archived_session_rows(name, archive_dir=ATTENDANCE_ARCHIVE_DIR):
+    rows = sorted(iter_archive_rows(session=name, archive_dir=archive_dir), key=lambda r: (r["Date"], r["Time"]))
+    return [{"Sr No.": i, **row} for i, row in enumerate(rows, 1)]
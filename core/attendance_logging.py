@@ -1,10 +1,29 @@
 import os
-import csv
 import logging
 from datetime import datetime
-from .utils import normalize, time_in_range
+from .utils import normalize
+from .timetable import get_timetable
+from .attendance_store import get_store
+from .attendance_sink import get_sink, flush_attendance
+from .metrics import registry
 
-def log_attendance(log_file_path, prn, student_name, students, timetable):
+def start_session(label=None):
+    prefix = f"final_attendance_report_{label}" if label else "final_attendance_report"
+    session = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    try:
+        get_store().start_session(session)
+    except Exception as e:
+        logging.error(f"Error creating attendance session: {e}")
+    return session
+
+def end_session(session):
+    try:
+        flush_attendance()
+        get_store().end_session(session)
+    except Exception as e:
+        logging.error(f"Error closing attendance session: {e}")
+
+def log_attendance(session, prn, student_name, students, timetable=None):
     try:
         now = datetime.now()
         day = now.strftime("%A")
@@ -14,32 +33,24 @@ def log_attendance(log_file_path, prn, student_name, students, timetable):
         class_ = student.get("Class", "")
         division = student.get("Division", "")
         batch = student.get("Batch", "")
-        subject_val = ""
-        faculty_val = ""
-        for ttr in timetable:
-            if (
-                normalize(ttr.get("Day", "")) == normalize(day)
-                and normalize(ttr.get("Division", "")) == normalize(division)
-                and normalize(ttr.get("Batch", "")) == normalize(batch)
-                and time_in_range(time_val, ttr.get("Time", ""))
-            ):
-                subject_val = ttr.get("Subject", "")
-                faculty_val = ttr.get("Faculty", "")
-                break
-        with open(log_file_path, "a", newline='', encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "", student.get("PRN", ""), student_name, class_, division,
-                time_val, date_val, day, subject_val, faculty_val
-            ])
+        with registry.time("timetable"):
+            ttr = (timetable or get_timetable()).lookup(day, division, batch, now)
+        subject_val = ttr.get("Subject", "")
+        faculty_val = ttr.get("Faculty", "")
+        get_sink().submit(session, {
+            "PRN": student.get("PRN", ""), "Student Name": student_name, "Class": class_,
+            "Division": division, "Time": time_val, "Date": date_val, "Day": day,
+            "Subject": subject_val, "Faculty": faculty_val
+        })
     except Exception as e:
         logging.error(f"Error logging attendance: {e}")
 
 def cleanup_old_logs(log_dir, days=30):
     try:
         now = datetime.now()
+        migrated = get_store().migrated_files()
         for f in os.listdir(log_dir):
-            if f.endswith(".csv"):
+            if f.endswith(".csv") and f in migrated:
                 path = os.path.join(log_dir, f)
                 file_time = datetime.fromtimestamp(os.path.getmtime(path))
                 if (now - file_time).days > days:
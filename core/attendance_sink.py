@@ -0,0 +1,78 @@
+import atexit
+import logging
+import threading
+from .attendance_store import get_store
+from .metrics import registry
+
+class AttendanceSink:
+    def __init__(self, store=None, flush_interval=2.0, max_batch=64):
+        self.store = store or get_store()
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="attendance-sink")
+        self.thread.start()
+        atexit.register(self.close)
+
+    def submit(self, session, row):
+        with self.lock:
+            self.buffer.append((session, row))
+            if len(self.buffer) >= self.max_batch:
+                self.wakeup.set()
+
+    def pending(self):
+        with self.lock:
+            return len(self.buffer)
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                batch, self.buffer = self.buffer, []
+            if not batch:
+                return 0
+            try:
+                with registry.time("attendance_write"):
+                    return self.store.insert_batch(batch)
+            except Exception as e:
+                logging.error(f"Error writing attendance batch: {e}")
+                with self.lock:
+                    self.buffer[:0] = batch
+                return 0
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def close(self, timeout=5.0):
+        self.stop_event.set()
+        self.wakeup.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.flush()
+
+_sink = None
+_sink_lock = threading.Lock()
+
+def get_sink():
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = AttendanceSink()
+        return _sink
+
+def use_sink(sink):
+    global _sink
+    with _sink_lock:
+        _sink = sink
+
+def flush_attendance():
+    with _sink_lock:
+        sink = _sink
+    if sink is not None:
+        sink.flush()
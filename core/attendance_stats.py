@@ -0,0 +1,82 @@
+import os
+import csv
+import logging
+from datetime import datetime, date
+from .attendance_store import get_store
+from .timetable import get_timetable
+from .utils import normalize
+
+SUMMARY_HEADERS = ["PRN", "Student Name", "Division", "Batch", "Subject", "Present", "Total", "Percentage"]
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def semester_start():
+    from .admin_backend import AdminBackend
+    value = AdminBackend.get_setting("semester_start", "").strip()
+    if value:
+        try:
+            return _parse_date(value)
+        except ValueError:
+            logging.error(f"Invalid semester_start setting: {value}")
+    first = get_store().first_attendance_date()
+    return _parse_date(first) if first else date.today()
+
+def defaulter_threshold():
+    from .admin_backend import AdminBackend
+    try:
+        return float(AdminBackend.get_setting("defaulter_threshold", "75"))
+    except ValueError:
+        return 75.0
+
+def attendance_summary(from_date=None, to_date=None):
+    from .admin_backend import AdminBackend
+    start = _parse_date(from_date) if from_date else semester_start()
+    end = _parse_date(to_date) if to_date else date.today()
+    present = get_store().presence_totals(start.isoformat(), end.isoformat())
+    timetable = get_timetable()
+    lecture_totals = {}
+    rows = []
+    for student in AdminBackend.get_students():
+        prn = student.get("PRN", "").strip()
+        if not prn:
+            continue
+        key = (normalize(student.get("Division", "")), normalize(student.get("Batch", "")))
+        if key not in lecture_totals:
+            lecture_totals[key] = timetable.lecture_totals(student.get("Division", ""), student.get("Batch", ""), start, end)
+        for subject, total in sorted(lecture_totals[key].items()):
+            attended = present.get((prn, subject), 0)
+            rows.append({
+                "PRN": prn, "Student Name": student.get("Name", ""),
+                "Division": student.get("Division", ""), "Batch": student.get("Batch", ""),
+                "Subject": subject, "Present": attended, "Total": total,
+                "Percentage": round(100.0 * attended / total, 1) if total else 0.0
+            })
+    return rows
+
+def find_defaulters(summary, threshold=None):
+    threshold = defaulter_threshold() if threshold is None else threshold
+    return sorted((r for r in summary if r["Total"] and r["Percentage"] < threshold), key=lambda r: (r["Percentage"], r["PRN"]))
+
+def overall_percentage(summary):
+    total = sum(r["Total"] for r in summary)
+    return round(100.0 * sum(r["Present"] for r in summary) / total, 1) if total else 0.0
+
+def export_summary(path, subject="", from_date=None, to_date=None):
+    # Returns the number of rows written; nothing is written (and path is left alone) when no lecture matched.
+    subject = subject.lower()
+    rows = [r for r in attendance_summary(from_date, to_date) if subject in r["Subject"].lower()]
+    if not rows:
+        return 0
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=SUMMARY_HEADERS)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(rows)
@@ -0,0 +1,354 @@
+import os
+import re
+import csv
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from .constants import *
+
+COLUMNS = ["prn", "student_name", "class", "division", "time", "date", "day", "subject", "faculty"]
+HEADER_COLUMNS = dict(zip(ATTENDANCE_HEADERS[1:], COLUMNS))
+HEADER_ALIASES = {
+    "Student Name": ["Student Name", "Full Name", "Name"],
+}
+SESSION_TIME_RE = re.compile(r"(\d{8}_\d{6})$")
+
+# Bumped whenever the aggregate tables change meaning; stored in PRAGMA user_version.
+AGGREGATES_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    archived_at TEXT
+);
+CREATE TABLE IF NOT EXISTS attendance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    prn TEXT NOT NULL DEFAULT '',
+    student_name TEXT NOT NULL DEFAULT '',
+    class TEXT NOT NULL DEFAULT '',
+    division TEXT NOT NULL DEFAULT '',
+    time TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    day TEXT NOT NULL DEFAULT '',
+    subject TEXT NOT NULL DEFAULT '',
+    faculty TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_session ON attendance(session);
+CREATE INDEX IF NOT EXISTS idx_attendance_date_subject ON attendance(date, subject);
+CREATE INDEX IF NOT EXISTS idx_attendance_subject_date ON attendance(subject, date);
+CREATE INDEX IF NOT EXISTS idx_attendance_prn_date ON attendance(prn, date);
+CREATE INDEX IF NOT EXISTS idx_attendance_division_date ON attendance(division, date);
+CREATE TABLE IF NOT EXISTS attendance_presence (
+    prn TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (prn, subject, date)
+);
+CREATE TABLE IF NOT EXISTS attendance_weekly (
+    prn TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    present INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (prn, subject, week_start)
+);
+CREATE INDEX IF NOT EXISTS idx_weekly_week ON attendance_weekly(week_start);
+CREATE TABLE IF NOT EXISTS migrated_files (
+    name TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+def session_started_at(name, default=None):
+    match = SESSION_TIME_RE.search(name)
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat(sep=" ")
+    return default or datetime.now().isoformat(sep=" ", timespec="seconds")
+
+def week_start(date):
+    day = datetime.strptime(date, "%Y-%m-%d")
+    return (day - timedelta(days=day.weekday())).strftime("%Y-%m-%d")
+
+def shift_date(date, days):
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+def whole_weeks(from_date, to_date):
+    # week_start of the first and last Monday-to-Sunday weeks lying entirely inside the range (None = unbounded).
+    first = last = None
+    if from_date:
+        first = from_date if week_start(from_date) == from_date else shift_date(week_start(from_date), 7)
+    if to_date:
+        last = shift_date(week_start(shift_date(to_date, 1)), -7)
+    return first, last
+
+def to_record(row):
+    return {h: row[c] for h, c in HEADER_COLUMNS.items()}
+
+class AttendanceStore:
+    def __init__(self, path=ATTENDANCE_DB):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._ensure_column("sessions", "archived_at", "TEXT")
+        # Aggregates are maintained on insert, so the full scan only runs once per database (or aggregate version),
+        # not on every startup of a store that simply has no attendance yet.
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < AGGREGATES_VERSION:
+            self.rebuild_aggregates()
+            self.conn.execute(f"PRAGMA user_version = {AGGREGATES_VERSION}")
+
+    def _ensure_column(self, table, column, decl):
+        existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            with self.conn:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    def start_session(self, name, started_at=None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO sessions (name, started_at) VALUES (?, ?)",
+                (name, started_at or session_started_at(name))
+            )
+
+    def end_session(self, name):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE sessions SET ended_at = ? WHERE name = ?",
+                (datetime.now().isoformat(sep=" ", timespec="seconds"), name)
+            )
+
+    def _insert(self, items):
+        params = [(session, *[str(row.get(h, "") or "") for h in HEADER_COLUMNS]) for session, row in items]
+        self.conn.executemany(
+            f"INSERT INTO attendance (session, {', '.join(COLUMNS)}) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+            params
+        )
+        self._update_aggregates(row for _, row in items)
+        return len(params)
+
+    def _update_aggregates(self, rows):
+        for row in rows:
+            prn, subject, date = (str(row.get(h, "") or "").strip() for h in ("PRN", "Subject", "Date"))
+            if not (prn and subject and date):
+                continue
+            try:
+                week = week_start(date)
+            except ValueError:
+                continue
+            # Only the first sighting of a student in a subject on a given day counts as a lecture attended.
+            cur = self.conn.execute("INSERT OR IGNORE INTO attendance_presence (prn, subject, date) VALUES (?, ?, ?)", (prn, subject, date))
+            if cur.rowcount:
+                self.conn.execute(
+                    "INSERT INTO attendance_weekly (prn, subject, week_start, present) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT (prn, subject, week_start) DO UPDATE SET present = present + 1",
+                    (prn, subject, week)
+                )
+
+    def rebuild_aggregates(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM attendance_presence")
+            self.conn.execute("DELETE FROM attendance_weekly")
+            cursor = self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM attendance ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                self._update_aggregates(to_record(r) for r in rows)
+
+    def presence_totals(self, from_date=None, to_date=None):
+        # Whole weeks inside the range are read from attendance_weekly; the partial weeks at either end are summed
+        # per day from attendance_presence, so a range never counts days outside it.
+        first, last = whole_weeks(from_date, to_date)
+        totals = {}
+        with self.lock:
+            if first is not None and last is not None and first > last:
+                self._add_presence(totals, "date BETWEEN ? AND ?", (from_date, to_date))
+                return totals
+            weekly, params = ["1"], []
+            if first:
+                weekly.append("week_start >= ?")
+                params.append(first)
+                if from_date < first:
+                    self._add_presence(totals, "date >= ? AND date < ?", (from_date, first))
+            if last:
+                weekly.append("week_start <= ?")
+                params.append(last)
+                self._add_presence(totals, "date > ? AND date <= ?", (shift_date(last, 6), to_date))
+            sql = f"SELECT prn, subject, SUM(present) AS present FROM attendance_weekly WHERE {' AND '.join(weekly)} GROUP BY prn, subject"
+            for row in self.conn.execute(sql, params):
+                key = (row["prn"], row["subject"])
+                totals[key] = totals.get(key, 0) + row["present"]
+        return totals
+
+    def _add_presence(self, totals, where, params):
+        for row in self.conn.execute(f"SELECT prn, subject, COUNT(*) AS present FROM attendance_presence WHERE {where} GROUP BY prn, subject", params):
+            key = (row["prn"], row["subject"])
+            totals[key] = totals.get(key, 0) + row["present"]
+
+    def first_attendance_date(self):
+        with self.lock:
+            row = self.conn.execute("SELECT MIN(date) FROM attendance_presence").fetchone()
+        return row[0] if row else None
+
+    def insert_batch(self, items):
+        with self.lock, self.conn:
+            return self._insert(items)
+
+    def _session_view(self, name, text=""):
+        # Sr No. is the row's position within its session, so it survives filtering and re-sorting.
+        sql = f"SELECT * FROM (SELECT ROW_NUMBER() OVER (ORDER BY id) AS sr, {', '.join(COLUMNS)} FROM attendance WHERE session = ?)"
+        params = [name]
+        if text:
+            sql += f" WHERE {' OR '.join(f'{c} LIKE ?' for c in COLUMNS)}"
+            params.extend([f"%{text}%"] * len(COLUMNS))
+        return sql, params
+
+    def count_session_rows(self, name, text=""):
+        sql, params = self._session_view(name, text)
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+    def page_session_rows(self, name, offset, limit, sort=None, descending=False, text=""):
+        sql, params = self._session_view(name, text)
+        column = "sr" if sort in (None, "Sr No.") else HEADER_COLUMNS.get(sort, "sr")
+        order = f"{column} {'DESC' if descending else 'ASC'}, sr"
+        with self.lock:
+            rows = self.conn.execute(f"{sql} ORDER BY {order} LIMIT ? OFFSET ?", params + [limit, offset]).fetchall()
+        return [{"Sr No.": r["sr"], **to_record(r)} for r in rows]
+
+    def sessions(self):
+        with self.lock:
+            return [r["name"] for r in self.conn.execute("SELECT name FROM sessions ORDER BY started_at, name")]
+
+    def session_rows(self, name):
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM attendance WHERE session = ? ORDER BY id", (name,)).fetchall()
+        return [{"Sr No.": i, **to_record(r)} for i, r in enumerate(rows, 1)]
+
+    def closed_sessions(self, before):
+        with self.lock:
+            return [r["name"] for r in self.conn.execute(
+                "SELECT name FROM sessions WHERE ended_at IS NOT NULL AND archived_at IS NULL AND started_at < ? ORDER BY started_at",
+                (before,)
+            )]
+
+    def is_archived(self, name):
+        with self.lock:
+            row = self.conn.execute("SELECT archived_at FROM sessions WHERE name = ?", (name,)).fetchone()
+        return bool(row and row["archived_at"])
+
+    def mark_archived(self, name):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM attendance WHERE session = ?", (name,))
+            self.conn.execute(
+                "UPDATE sessions SET archived_at = ? WHERE name = ?",
+                (datetime.now().isoformat(sep=" ", timespec="seconds"), name)
+            )
+
+    def matching_subjects(self, subject):
+        needle = subject.lower()
+        with self.lock:
+            return [r[0] for r in self.conn.execute("SELECT DISTINCT subject FROM attendance") if needle in r[0].lower()]
+
+    def _where(self, subject=None, from_date=None, to_date=None):
+        clauses, params = [], []
+        if subject:
+            subjects = self.matching_subjects(subject)
+            if not subjects:
+                return None, None
+            clauses.append(f"subject IN ({', '.join('?' * len(subjects))})")
+            params.extend(subjects)
+        if from_date:
+            clauses.append("date >= ?")
+            params.append(from_date)
+        if to_date:
+            clauses.append("date <= ?")
+            params.append(to_date)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def iter_query(self, subject=None, from_date=None, to_date=None, chunk_size=1000):
+        where, params = self._where(subject, from_date, to_date)
+        if where is None:
+            return
+        # A separate connection lets WAL readers stream without holding the writer's lock.
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM attendance {where} ORDER BY date, id", params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for r in rows:
+                    yield to_record(r)
+        finally:
+            conn.close()
+
+    def migrated_files(self):
+        with self.lock:
+            return {r[0] for r in self.conn.execute("SELECT name FROM migrated_files")}
+
+    def migrate_csv_logs(self, log_dir=ATTENDANCE_DIR):
+        done = self.migrated_files()
+        migrated = 0
+        for fname in sorted(os.listdir(log_dir)):
+            if not fname.endswith(".csv") or fname in done:
+                continue
+            path = os.path.join(log_dir, fname)
+            try:
+                name = os.path.splitext(fname)[0]
+                mtime = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(sep=" ", timespec="seconds")
+                with open(path, newline="", encoding="utf-8") as f:
+                    rows = [r for r in (normalize_legacy_row(row) for row in csv.DictReader(f)) if r]
+                with self.lock, self.conn:
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO sessions (name, started_at, ended_at) VALUES (?, ?, ?)",
+                        (name, session_started_at(name, mtime), mtime)
+                    )
+                    self._insert([(name, row) for row in rows])
+                    self.conn.execute(
+                        "INSERT INTO migrated_files (name, migrated_at) VALUES (?, ?)",
+                        (fname, datetime.now().isoformat(sep=" ", timespec="seconds"))
+                    )
+                migrated += 1
+            except Exception as e:
+                logging.error(f"Error migrating {fname}: {e}")
+        return migrated
+
+def normalize_legacy_row(row):
+    record = {}
+    for header in HEADER_COLUMNS:
+        for alias in HEADER_ALIASES.get(header, [header]):
+            if row.get(alias):
+                record[header] = row[alias].strip()
+                break
+    timestamp = (row.get("Timestamp") or "").strip()
+    if timestamp and not record.get("Date"):
+        date_part, _, time_part = timestamp.partition(" ")
+        record["Date"] = date_part
+        record["Time"] = record.get("Time") or time_part[:5]
+    if not record.get("PRN") and not record.get("Student Name"):
+        return None
+    return record
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AttendanceStore()
+        return _store
+
+def use_store(store):
+    # Points the shared store elsewhere, e.g. a scratch database for benchmarks.
+    global _store
+    with _store_lock:
+        _store = store
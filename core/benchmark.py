@@ -0,0 +1,253 @@
+import os
+import csv
+import time
+import tempfile
+import logging
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+from .constants import *
+from .utils import list_face_images, normalize
+from .tracking import UNKNOWN
+from .detection import detection_size
+from .inference import inference_backend
+from .motion import MotionGate
+from .attendance_store import AttendanceStore, use_store
+from .attendance_sink import AttendanceSink, use_sink
+from .recognition import RecognitionEngine, RecognitionModels
+
+STAGES = ("capture", "detect", "embed", "classify", "log")
+PERCENTILES = (50, 90, 95, 99)
+
+class StageTimes:
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+
+    def add(self, stage, started):
+        elapsed = time.perf_counter() - started
+        self.samples[stage].append(elapsed)
+        return elapsed
+
+    def summary(self):
+        out = {}
+        for stage, values in self.samples.items():
+            ms = np.asarray(values, dtype=np.float64) * 1000
+            entry = {"count": len(ms), "total_ms": round(float(ms.sum()), 3)}
+            if len(ms):
+                entry["mean_ms"] = round(float(ms.mean()), 3)
+                entry.update({f"p{q}_ms": round(float(np.percentile(ms, q)), 3) for q in PERCENTILES})
+                entry["max_ms"] = round(float(ms.max()), 3)
+            out[stage] = entry
+        return out
+
+class Accuracy:
+    # Precision is over recognized (non-Unknown) predictions; recall is over the identities that should have been found.
+    def __init__(self):
+        self.tp = self.fp = 0
+        self.expected = self.found = 0
+
+    def add_prediction(self, label, expected):
+        if label == UNKNOWN:
+            return
+        if label in expected:
+            self.tp += 1
+        else:
+            self.fp += 1
+
+    def add_expected(self, expected, seen):
+        self.expected += len(expected)
+        self.found += len(expected & seen)
+
+    def summary(self):
+        precision = self.tp / (self.tp + self.fp) if self.tp + self.fp else None
+        recall = self.found / self.expected if self.expected else None
+        return {"tp": self.tp, "fp": self.fp, "fn": self.expected - self.found, "precision": precision, "recall": recall}
+
+def load_labels(path=LABELS_CSV):
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return {normalize(row.get("PRN", "")): str(row.get("PRN", "")).strip() for row in csv.DictReader(f) if row.get("PRN")}
+    except FileNotFoundError:
+        return {}
+
+def labelled_images(folders, labels):
+    # Each image's expected identity is its folder name when that folder is a PRN in labels.csv.
+    items = []
+    for root in folders:
+        for name in sorted(os.listdir(root)):
+            folder = os.path.join(root, name)
+            if os.path.isdir(folder):
+                expected = labels.get(normalize(name))
+                items.extend((path, {expected} if expected else set()) for path in list_face_images(folder))
+    return items
+
+def parse_video(spec):
+    # "clip.mp4" or "clip.mp4=PRN1,PRN2" listing who appears in the clip.
+    if os.path.exists(spec) or "=" not in spec:
+        return spec, set()
+    path, _, expected = spec.rpartition("=")
+    return path, {p.strip() for p in expected.split(",") if p.strip()}
+
+class TimedEngine(RecognitionEngine):
+    # Attributes the attendance write (log_attendance plus a synchronous flush) to the log stage.
+    def __init__(self, benchmark, session, **kwargs):
+        super().__init__(session, **kwargs)
+        self.benchmark = benchmark
+
+    def log(self, key, now):
+        started = time.perf_counter()
+        super().log(key, now)
+        self.benchmark.sink.flush()
+        self.benchmark.times.add("log", started)
+
+class Benchmark:
+    def __init__(self, models=None, log_dir=None):
+        self.models = models or RecognitionModels()
+        self.times = StageTimes()
+        self.accuracy = Accuracy()
+        self.frames = 0
+        self.detected_frames = 0
+        self.faces = 0
+        self.inputs = []
+        self.elapsed = 0.0
+        # Attendance goes to a scratch database so the log stage is real without touching the live store.
+        self.log_dir = log_dir or tempfile.mkdtemp(prefix="attendance_benchmark_")
+        self.store = AttendanceStore(os.path.join(self.log_dir, "attendance.db"))
+        self.sink = AttendanceSink(self.store, flush_interval=3600)
+        use_store(self.store)
+        use_sink(self.sink)
+
+    def engine(self, label, gate=True, **kwargs):
+        engine = TimedEngine(self, f"benchmark_{label}", models=self.models, gate=MotionGate.from_settings() if gate else None, **kwargs)
+        self.store.start_session(engine.session)
+        return engine
+
+    def recognize(self, engine, frame, whole_frame=False):
+        # RecognitionEngine.process with each stage timed separately.
+        models = self.models
+        started = time.perf_counter()
+        boxes, landmarks = models.detector.detect(frame)
+        self.times.add("detect", started)
+        if whole_frame and not len(boxes):
+            # Pre-cropped faces (processed_dataset) often have no detectable face; enrollment embeds them whole too.
+            boxes, landmarks = np.array([[0, 0, frame.shape[1], frame.shape[0]]]), None
+        tracks, pending, crops = engine.begin(frame, boxes, landmarks)
+        started = time.perf_counter()
+        embeddings, valid = models.embed(crops)
+        self.times.add("embed", started)
+        started = time.perf_counter()
+        results = models.predict(embeddings, valid)
+        self.times.add("classify", started)
+        self.faces += len(boxes)
+        return engine.finish(boxes, tracks, pending, results)
+
+    def run_images(self, items):
+        # Stills are unrelated, so each starts with an empty tracker and is confirmed on a single hit.
+        engine = self.engine("images", gate=False, face_confirm_count=1, time_window=timedelta(0))
+        started_all = time.perf_counter()
+        for path, expected in items:
+            started = time.perf_counter()
+            frame = cv2.imread(path)
+            self.times.add("capture", started)
+            if frame is None:
+                continue
+            self.frames += 1
+            self.detected_frames += 1
+            engine.tracker.tracks = []
+            result = self.recognize(engine, frame, whole_frame=True)
+            detections = result["detections"]
+            label = UNKNOWN
+            if detections:
+                label = max(detections, key=lambda d: (d["box"][2] - d["box"][0]) * (d["box"][3] - d["box"][1]))["label"]
+            self.accuracy.add_prediction(label, expected)
+            self.accuracy.add_expected(expected, {label})
+        self.elapsed += time.perf_counter() - started_all
+        self.inputs.append({"type": "images", "count": len(items)})
+
+    def run_video(self, path, expected, gate=True):
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            logging.error(f"Could not open video {path}")
+            return
+        engine = self.engine(os.path.splitext(os.path.basename(path))[0], gate)
+        seen = set()
+        frames = 0
+        started_all = time.perf_counter()
+        while True:
+            started = time.perf_counter()
+            ok, frame = cap.read()
+            if not ok:
+                break
+            self.times.add("capture", started)
+            frames += 1
+            if not engine.should_detect(frame):
+                continue
+            self.detected_frames += 1
+            started = time.perf_counter()
+            result = self.recognize(engine, frame)
+            engine.record_latency(time.perf_counter() - started)
+            for label in result["names"]:
+                if label == UNKNOWN:
+                    continue
+                seen.add(label)
+                if expected:
+                    self.accuracy.add_prediction(label, expected)
+        cap.release()
+        self.elapsed += time.perf_counter() - started_all
+        self.frames += frames
+        # Recall for clips is per person: everyone listed should be recognized at least once.
+        self.accuracy.add_expected(expected, seen)
+        self.inputs.append({"type": "video", "path": path, "frames": frames, "expected": sorted(expected), "recognized": sorted(seen)})
+
+    def report(self):
+        self.sink.close()
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "backend": inference_backend(),
+            "detection_size": detection_size(),
+            "inputs": self.inputs,
+            "frames": self.frames,
+            "detected_frames": self.detected_frames,
+            "faces": self.faces,
+            "elapsed_s": round(self.elapsed, 3),
+            "frames_per_sec": round(self.frames / self.elapsed, 2) if self.elapsed else None,
+            "faces_per_sec": round(self.faces / self.elapsed, 2) if self.elapsed else None,
+            "stages": self.times.summary(),
+            "accuracy": self.accuracy.summary(),
+            "attendance_db": self.store.path,
+        }
+
+def compare_reports(current, baseline, tolerance=0.10):
+    # Returns human-readable regressions: p95 latency up, throughput or precision/recall down by more than tolerance.
+    problems = []
+    for stage, entry in current["stages"].items():
+        old = baseline.get("stages", {}).get(stage, {}).get("p95_ms")
+        new = entry.get("p95_ms")
+        if old and new and new > old * (1 + tolerance):
+            problems.append(f"{stage} p95 {old:.1f}ms -> {new:.1f}ms")
+    old, new = baseline.get("faces_per_sec"), current.get("faces_per_sec")
+    if old and new is not None and new < old * (1 - tolerance):
+        problems.append(f"faces/sec {old:.1f} -> {new:.1f}")
+    for key in ("precision", "recall"):
+        old, new = baseline.get("accuracy", {}).get(key), current["accuracy"].get(key)
+        if old is not None and new is not None and new < old - tolerance * old:
+            problems.append(f"{key} {old:.3f} -> {new:.3f}")
+    return problems
+
+def format_report(report):
+    lines = [
+        f"Backend {report['backend']}, detection size {report['detection_size']}",
+        f"{report['frames']} frames ({report['detected_frames']} detected), {report['faces']} faces in {report['elapsed_s']:.1f}s: "
+        f"{report['frames_per_sec'] or 0:.1f} frames/s, {report['faces_per_sec'] or 0:.1f} faces/s",
+        f"{'stage':<9} {'count':>6} {'mean':>8} " + " ".join(f"{'p' + str(q):>8}" for q in PERCENTILES) + f" {'max':>8}",
+    ]
+    for stage, entry in report["stages"].items():
+        if not entry["count"]:
+            lines.append(f"{stage:<9} {0:>6}")
+            continue
+        values = [entry["mean_ms"]] + [entry[f"p{q}_ms"] for q in PERCENTILES] + [entry["max_ms"]]
+        lines.append(f"{stage:<9} {entry['count']:>6} " + " ".join(f"{v:>6.1f}ms" for v in values))
+    acc = report["accuracy"]
+    fmt = lambda v: "n/a" if v is None else f"{v:.3f}"
+    lines.append(f"precision {fmt(acc['precision'])}, recall {fmt(acc['recall'])} (tp {acc['tp']}, fp {acc['fp']}, fn {acc['fn']})")
+    return "\n".join(lines)
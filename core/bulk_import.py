@@ -0,0 +1,73 @@
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .constants import *
+from .utils import list_face_images
+
+_detector = None
+_embedder = None
+
+def _init_worker():
+    global _detector, _embedder
+    from .detection import FaceDetector
+    from .embedding import ArcFaceEmbedder
+    _detector = FaceDetector(YOLO_MODEL_PATH)
+    _embedder = ArcFaceEmbedder()
+
+def _embed_chunk(paths):
+    from .enrollment import embed_face_images
+    embeddings, ok_paths = embed_face_images(paths, _detector, _embedder)
+    return len(paths), dict(zip(ok_paths, embeddings))
+
+def default_workers():
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+def embed_parallel(paths, workers=None, chunk_size=16, progress=None, cancelled=None):
+    embedded = {}
+    done = 0
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    if not chunks:
+        return embedded
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers or default_workers(), mp_context=ctx, initializer=_init_worker) as pool:
+        futures = [pool.submit(_embed_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            if cancelled and cancelled():
+                for pending in futures:
+                    pending.cancel()
+                break
+            try:
+                count, results = future.result()
+                embedded.update(results)
+            except Exception as e:
+                logging.error(f"Error embedding image chunk: {e}")
+                count = 0
+            done += count
+            if progress:
+                progress(done, len(paths))
+    return embedded
+
+def bulk_import_folders(folders, workers=None, progress=None, cancelled=None):
+    from .admin_backend import AdminBackend, log_action
+    from .dataset_index import add_cache_entries, schedule_rebuild
+    added, skipped = [], []
+    for i, folder in enumerate(folders, 1):
+        if cancelled and cancelled():
+            break
+        ok, _ = AdminBackend.add_face_folder(folder, rebuild=False, cancelled=cancelled)
+        (added if ok else skipped).append(os.path.basename(folder.rstrip(os.sep)))
+        if progress:
+            progress(i, len(folders), "Copying folders")
+    paths = []
+    for name in added:
+        paths.extend(list_face_images(os.path.join(FACE_DATASET_DIR, name)))
+    if progress:
+        progress(0, len(paths), "Embedding images")
+    embedded = embed_parallel(paths, workers=workers, progress=progress, cancelled=cancelled)
+    if added:
+        # On cancel the copied folders stay; images not reached here are left uncached so the rebuild embeds them.
+        add_cache_entries([p for p in paths if p in embedded] if cancelled and cancelled() else paths, embedded)
+        schedule_rebuild()
+        log_action("Bulk Import Face Folders", f"{len(added)} folders, {len(embedded)}/{len(paths)} images embedded")
+    return {"added": len(added), "skipped": len(skipped), "images": len(paths), "embedded": len(embedded)}
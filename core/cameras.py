@@ -0,0 +1,155 @@
+import time
+import logging
+import threading
+from datetime import timedelta
+from .attendance_logging import start_session, end_session
+from .attendance_sink import get_sink
+from .metrics import registry
+from .pipeline import DropOldestQueue, open_source
+from .motion import MotionGate
+from .recognition import RecognitionEngine, RecognitionModels
+
+def parse_source(value):
+    value = str(value).strip()
+    return int(value) if value.isdigit() else value
+
+def camera_sources():
+    from .admin_backend import AdminBackend
+    value = AdminBackend.get_setting("camera_sources", "0")
+    return [parse_source(v) for v in value.split(",") if v.strip()] or [0]
+
+class ModelLoader(threading.Thread):
+    def __init__(self, threshold=None):
+        super().__init__(daemon=True, name="model-loader")
+        self.threshold = threshold
+        self.models = None
+        self.error = None
+
+    def run(self):
+        try:
+            models = RecognitionModels(self.threshold)
+            models.warm_up()
+            self.models = models
+        except Exception as e:
+            logging.error(f"Error loading face models: {e}")
+            self.error = e
+
+    @property
+    def done(self):
+        return self.models is not None or self.error is not None
+
+class Camera:
+    def __init__(self, name, source, engine):
+        self.name = name
+        self.source = source
+        self.engine = engine
+        self.preview_queue = DropOldestQueue(maxsize=1)
+        self.frame_queue = DropOldestQueue(maxsize=1)
+        self.result_queue = DropOldestQueue(maxsize=2)
+        self.worker = open_source(source, [self.preview_queue, self.frame_queue], drain=self.frame_queue, name=f"capture-{name}")
+
+    @property
+    def session(self):
+        return self.engine.session
+
+class BatchScheduler(threading.Thread):
+    # Pulls at most one frame per camera per round, starting after the last camera served, so a fast
+    # source cannot starve the others; the round goes through YOLO and ArcFace as single batches.
+    def __init__(self, models, cameras, max_batch=4):
+        super().__init__(daemon=True, name="inference-scheduler")
+        self.models = models
+        self.cameras = cameras
+        self.max_batch = max_batch
+        self.stop_event = threading.Event()
+        self.next_index = 0
+        self.dropped = 0
+
+    def next_batch(self):
+        batch = []
+        n = len(self.cameras)
+        for k in range(n):
+            camera = self.cameras[(self.next_index + k) % n]
+            frame = camera.frame_queue.get_latest()
+            if frame is not None:
+                batch.append((camera, frame))
+                if len(batch) >= self.max_batch:
+                    self.next_index = (self.next_index + k + 1) % n
+                    return batch
+        self.next_index = (self.next_index + 1) % n if n else 0
+        return batch
+
+    def process_batch(self, batch):
+        # Cameras whose scene has not changed reuse their last boxes instead of taking a detector slot.
+        active = []
+        for camera, frame in batch:
+            if camera.engine.should_detect(frame):
+                active.append((camera, frame))
+            else:
+                camera.result_queue.put_latest(camera.engine.last_result)
+        if not active:
+            return
+        started = time.monotonic()
+        with self.models.lock:
+            self.models.refresh_recognizer()
+            detections = self.models.detect_batch([frame for _, frame in active])
+            staged, crops = [], []
+            for (camera, frame), (boxes, landmarks) in zip(active, detections):
+                tracks, pending, camera_crops = camera.engine.begin(frame, boxes, landmarks)
+                staged.append((camera, boxes, tracks, pending, len(crops), len(camera_crops)))
+                crops.extend(camera_crops)
+            results = self.models.classify(crops)
+            for camera, boxes, tracks, pending, offset, count in staged:
+                camera.result_queue.put_latest(camera.engine.finish(boxes, tracks, pending, results[offset:offset + count]))
+        latency = time.monotonic() - started
+        for camera, _ in active:
+            camera.engine.record_latency(latency)
+
+    def update_gauges(self):
+        dropped = sum(c.frame_queue.dropped for c in self.cameras)
+        if dropped > self.dropped:
+            registry.count("frames_dropped", dropped - self.dropped)
+            self.dropped = dropped
+        registry.gauge("queue_depth", sum(c.frame_queue.qsize() for c in self.cameras))
+        registry.gauge("attendance_pending", get_sink().pending())
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.update_gauges()
+            batch = self.next_batch()
+            if not batch:
+                self.stop_event.wait(0.01)
+                continue
+            try:
+                self.process_batch(batch)
+            except Exception as e:
+                logging.error(f"Error in inference scheduler: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+
+class CameraManager:
+    def __init__(self, sources, models=None, max_batch=4, face_confirm_count=5, time_window=timedelta(minutes=2), on_attendance=None):
+        self.models = models or RecognitionModels()
+        self.cameras = []
+        for i, source in enumerate(sources, 1):
+            name = f"cam{i}"
+            session = start_session(name if len(sources) > 1 else None)
+            callback = (lambda student, ts, name=name: on_attendance(name, student, ts)) if on_attendance else None
+            engine = RecognitionEngine(session, face_confirm_count=face_confirm_count, time_window=time_window, on_attendance=callback, models=self.models, gate=MotionGate.from_settings())
+            self.cameras.append(Camera(name, source, engine))
+        self.scheduler = BatchScheduler(self.models, self.cameras, max_batch=max_batch)
+
+    def start(self):
+        for camera in self.cameras:
+            camera.worker.start()
+        self.scheduler.start()
+
+    def stop(self, timeout=2.0):
+        for camera in self.cameras:
+            camera.worker.stop()
+        self.scheduler.stop()
+        for thread in [c.worker for c in self.cameras] + [self.scheduler]:
+            if thread.is_alive():
+                thread.join(timeout)
+        for camera in self.cameras:
+            end_session(camera.session)
@@ -4,6 +4,9 @@ DATA_DIR = "admin_system_data"
 USERS_CSV = os.path.join(DATA_DIR, "users.csv")
 STUDENTS_CSV = os.path.join(DATA_DIR, "students.csv")
 ATTENDANCE_DIR = os.path.join(DATA_DIR, "face_logs")
+ATTENDANCE_DB = os.path.join(DATA_DIR, "attendance.db")
+ATTENDANCE_ARCHIVE_DIR = os.path.join(DATA_DIR, "attendance_archive")
+ATTENDANCE_HEADERS = ["Sr No.", "PRN", "Student Name", "Class", "Division", "Time", "Date", "Day", "Subject", "Faculty"]
 TIMETABLE_DIR = os.path.join(DATA_DIR, "timetable")
 TIMETABLE_CSV = os.path.join(TIMETABLE_DIR, "timetable.csv")
 SETTINGS_CSV = os.path.join(DATA_DIR, "settings.csv")
@@ -11,8 +14,12 @@ NOTIFICATIONS_CSV = os.path.join(DATA_DIR, "notifications.csv")
 LOGS_CSV = os.path.join(DATA_DIR, "system_logs.csv")
 FACE_DATASET_DIR = os.path.join(DATA_DIR, "dataset")
 LABELS_CSV = os.path.join(FACE_DATASET_DIR, "labels.csv")
+EMBEDDINGS_NPZ = os.path.join(FACE_DATASET_DIR, "arcface_embeddings.npz")
+EMBEDDING_CACHE = os.path.join(FACE_DATASET_DIR, "embedding_cache.pkl")
 YOLO_MODEL_PATH = "yolov8-face.pt"
 SVM_MODEL_PATH = "arcface_svm_recognizer.joblib"
+YOLO_ONNX_PATH = "yolov8-face.onnx"
+ARCFACE_ONNX_PATH = "arcface.onnx"
 
 for d in [DATA_DIR, ATTENDANCE_DIR, FACE_DATASET_DIR, TIMETABLE_DIR]:
     os.makedirs(d, exist_ok=True)
\ No newline at end of file
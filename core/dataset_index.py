@@ -0,0 +1,170 @@
+import os
+import pickle
+import shutil
+import hashlib
+import logging
+import threading
+import multiprocessing
+import numpy as np
+from .constants import *
+from .utils import list_face_images, replace_file
+
+CACHE_VERSION = 2
+
+def file_md5(path):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_key(path, root=FACE_DATASET_DIR):
+    # Dataset-relative with "/" separators, so a cache built on Windows still matches on Linux and back.
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+def legacy_key(path):
+    # Older caches were keyed on Windows paths like admin_system_data\processed_dataset\<label>\<name>_face0.jpg.
+    parts = path.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+def load_cache(cache_path=EMBEDDING_CACHE):
+    try:
+        with open(cache_path, "rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return {"version": CACHE_VERSION, "entries": {}}
+    except Exception as e:
+        logging.error(f"Error loading embedding cache: {e}")
+        return {"version": CACHE_VERSION, "entries": {}}
+    if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+        return data
+    # Older caches map (path, md5) -> embedding, keyed on Windows paths of processed crops. Their keys are
+    # normalised to dataset-relative ones, but the vectors came from the old DeepFace.represent pipeline and are
+    # not comparable with the current embedder's, so they are never reused: the first sync re-embeds the dataset.
+    entries = {}
+    for key, embedding in data.items():
+        if isinstance(key, tuple) and len(key) == 2:
+            rel = legacy_key(key[0])
+            entries[rel] = {"size": None, "mtime": None, "md5": key[1], "label": rel.split("/")[0], "legacy": True, "embedding": np.asarray(embedding, dtype=np.float32)}
+    return {"version": CACHE_VERSION, "entries": entries}
+
+def save_cache(cache, cache_path=EMBEDDING_CACHE):
+    replace_file(cache_path, lambda f: pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+def scan_dataset(root=FACE_DATASET_DIR):
+    for label in sorted(os.listdir(root)):
+        folder = os.path.join(root, label)
+        if os.path.isdir(folder):
+            for path in list_face_images(folder):
+                yield label, path
+
+def sync_embeddings(root=FACE_DATASET_DIR, cache_path=EMBEDDING_CACHE, embed_files=None):
+    cache = load_cache(cache_path)
+    old_entries = cache["entries"]
+    by_hash = {e["md5"]: e["embedding"] for e in old_entries.values() if e.get("md5") and e.get("embedding") is not None and not e.get("legacy")}
+    entries = {}
+    missing = []
+    for label, path in scan_dataset(root):
+        rel = cache_key(path, root)
+        st = os.stat(path)
+        entry = old_entries.get(rel)
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+            entry["label"] = label
+            entries[rel] = entry
+            continue
+        md5 = file_md5(path)
+        entries[rel] = {"size": st.st_size, "mtime": st.st_mtime, "md5": md5, "label": label, "embedding": by_hash.get(md5)}
+        if entries[rel]["embedding"] is None:
+            missing.append(rel)
+    if missing:
+        if embed_files is None:
+            from .enrollment import embed_image_files as embed_files
+        embedded = embed_files([os.path.join(root, rel) for rel in missing])
+        for rel in missing:
+            embedding = embedded.get(os.path.join(root, rel))
+            if embedding is not None:
+                entries[rel]["embedding"] = np.asarray(embedding, dtype=np.float32)
+    cache["entries"] = entries
+    save_cache(cache, cache_path)
+    return entries, len(missing)
+
+def add_cache_entries(paths, embedded, root=FACE_DATASET_DIR, cache_path=EMBEDDING_CACHE):
+    cache = load_cache(cache_path)
+    for path in paths:
+        rel = cache_key(path, root)
+        st = os.stat(path)
+        embedding = embedded.get(path)
+        cache["entries"][rel] = {
+            "size": st.st_size, "mtime": st.st_mtime, "md5": file_md5(path),
+            "label": rel.split("/")[0],
+            "embedding": np.asarray(embedding, dtype=np.float32) if embedding is not None else None
+        }
+    save_cache(cache, cache_path)
+
+def build_gallery(entries):
+    rows = [(e["label"], e["embedding"]) for _, e in sorted(entries.items()) if e["embedding"] is not None]
+    if not rows:
+        return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=str)
+    labels, embeddings = zip(*rows)
+    return np.stack(embeddings).astype(np.float32), np.asarray(labels, dtype=str)
+
+def keep_original(path):
+    # The first rebuild keeps the shipped artifact next to the new one instead of silently replacing it.
+    backup = path + ".orig"
+    if os.path.exists(path) and not os.path.exists(backup):
+        shutil.copy2(path, backup)
+        return backup
+    return None
+
+def train_svm(X, y):
+    import joblib
+    from sklearn.svm import SVC
+    if len(set(y)) < 2:
+        logging.error("Not enough identities to train the SVM recognizer")
+        return False
+    clf = SVC(kernel="linear", probability=True, class_weight="balanced")
+    clf.fit(X, y)
+    keep_original(SVM_MODEL_PATH)
+    replace_file(SVM_MODEL_PATH, lambda f: joblib.dump(clf, f))
+    return True
+
+def rebuild_dataset_index():
+    from .admin_backend import AdminBackend, log_action
+    from .recognizers import EmbeddingIndex
+    try:
+        entries, embedded = sync_embeddings()
+        X, y = build_gallery(entries)
+        backup = keep_original(EMBEDDINGS_NPZ)
+        EmbeddingIndex(X, y).save(EMBEDDINGS_NPZ)
+        if AdminBackend.get_setting("recognizer_backend", "svm").strip().lower() == "svm":
+            train_svm(X, y)
+        details = f"{len(y)} embeddings, {embedded} newly embedded"
+        if backup:
+            details += f", previous index kept as {backup}"
+        log_action("Rebuild Face Index", details)
+    except Exception as e:
+        logging.error(f"Error rebuilding face index: {e}")
+
+_rebuild_lock = threading.Lock()
+_rebuild_pending = False
+_rebuild_thread = None
+
+def _run_rebuilds():
+    global _rebuild_pending, _rebuild_thread
+    while True:
+        with _rebuild_lock:
+            if not _rebuild_pending:
+                _rebuild_thread = None
+                return
+            _rebuild_pending = False
+        proc = multiprocessing.get_context("spawn").Process(target=rebuild_dataset_index, name="face-index-rebuild")
+        proc.start()
+        proc.join()
+
+def schedule_rebuild():
+    global _rebuild_pending, _rebuild_thread
+    with _rebuild_lock:
+        _rebuild_pending = True
+        if _rebuild_thread is None:
+            _rebuild_thread = threading.Thread(target=_run_rebuilds, daemon=True, name="face-index-rebuild")
+            _rebuild_thread.start()
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+def letterbox_frame(frame, size):
+    h, w = frame.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+    left, top = (size - new_w) // 2, (size - new_h) // 2
+    padded = cv2.copyMakeBorder(resized, top, size - new_h - top, left, size - new_w - left, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    return padded, scale, left, top
+
+def detection_size():
+    from .admin_backend import AdminBackend
+    try:
+        return int(AdminBackend.get_setting("detection_size", "640"))
+    except ValueError:
+        return 640
+
+class FaceDetector:
+    # input_size is the square side YOLO sees; 0 or None runs on the native frame.
+    def __init__(self, model_path, input_size=640):
+        from ultralytics import YOLO
+        self.model = YOLO(model_path)
+        self.input_size = input_size
+
+    def _to_source(self, boxes, landmarks, frame, scale=1.0, left=0, top=0):
+        h, w = frame.shape[:2]
+        # Undo the letterbox so boxes and landmarks are in source pixels and ArcFace crops the full-resolution frame.
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - left) / scale).clip(0, w)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - top) / scale).clip(0, h)
+        if landmarks is not None:
+            landmarks = (landmarks - np.array([left, top], dtype=np.float32)) / scale
+        return boxes.astype(int), landmarks
+
+    def _parse(self, results, frame, scale=1.0, left=0, top=0):
+        if not results.boxes.xyxy.numel():
+            return np.empty((0, 4), dtype=int), None
+        landmarks = None
+        if results.keypoints is not None and results.keypoints.xy.numel():
+            landmarks = results.keypoints.xy.cpu().numpy()
+        return self._to_source(results.boxes.xyxy.cpu().numpy(), landmarks, frame, scale, left, top)
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames):
+        if not frames:
+            return []
+        if not self.input_size:
+            results = self.model(list(frames), verbose=False)
+            return [self._parse(r, f) for r, f in zip(results, frames)]
+        boxed = [letterbox_frame(f, self.input_size) for f in frames]
+        results = self.model([b[0] for b in boxed], imgsz=self.input_size, verbose=False)
+        return [self._parse(r, f, scale, left, top) for r, f, (_, scale, left, top) in zip(results, frames, boxed)]
@@ -0,0 +1,72 @@
+import math
+import cv2
+import numpy as np
+
+def align_face(face_img, left_eye, right_eye):
+    dx = right_eye[0] - left_eye[0]
+    dy = right_eye[1] - left_eye[1]
+    if dx == 0 and dy == 0:
+        return face_img
+    angle = math.degrees(math.atan2(dy, dx))
+    h, w = face_img.shape[:2]
+    center = ((left_eye[0] + right_eye[0]) / 2.0, (left_eye[1] + right_eye[1]) / 2.0)
+    matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+    return cv2.warpAffine(face_img, matrix, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+def letterbox(img, size):
+    target_h, target_w = size
+    h, w = img.shape[:2]
+    scale = min(target_h / h, target_w / w)
+    new_w, new_h = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+    resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+    out = np.zeros((target_h, target_w, 3), dtype=resized.dtype)
+    top = (target_h - new_h) // 2
+    left = (target_w - new_w) // 2
+    out[top:top + new_h, left:left + new_w] = resized
+    return out
+
+def spatial_size(shape):
+    # (h, w), (h, w, c) or a Keras (None, h, w, c): the two dims before the channels, or the pair itself.
+    shape = tuple(shape)
+    if len(shape) >= 3:
+        shape = shape[-3:-1]
+    return int(shape[0]), int(shape[1])
+
+class ArcFaceEmbedder:
+    def __init__(self, model_name="ArcFace"):
+        from deepface import DeepFace
+        client = DeepFace.build_model(model_name)
+        self.model = getattr(client, "model", client)
+        self.input_size = spatial_size(getattr(client, "input_shape", None) or self.model.input_shape)
+        self.dim = int(self.model.output_shape[-1])
+
+    def infer(self, batch):
+        return np.asarray(self.model(batch, training=False), dtype=np.float32)
+
+    def preprocess(self, face_img, landmarks=None):
+        if landmarks is not None and len(landmarks) >= 2:
+            face_img = align_face(face_img, landmarks[0], landmarks[1])
+        return letterbox(face_img, self.input_size)
+
+    def crop_faces(self, frame, boxes, landmarks=None):
+        crops = []
+        for i, (x1, y1, x2, y2) in enumerate(boxes):
+            if x2 <= x1 or y2 <= y1:
+                crops.append(None)
+                continue
+            kps = None
+            if landmarks is not None:
+                kps = landmarks[i] - np.array([x1, y1], dtype=np.float32)
+            crops.append(self.preprocess(frame[y1:y2, x1:x2], kps))
+        return crops
+
+    def embed_batch(self, crops):
+        valid = [i for i, c in enumerate(crops) if c is not None]
+        embeddings = np.zeros((len(crops), self.dim), dtype=np.float32)
+        if not valid:
+            return embeddings, np.zeros(len(crops), dtype=bool)
+        batch = np.stack([crops[i] for i in valid]).astype(np.float32) / 255.0
+        embeddings[valid] = self.infer(batch)
+        mask = np.zeros(len(crops), dtype=bool)
+        mask[valid] = True
+        return embeddings, mask
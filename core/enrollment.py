@@ -0,0 +1,34 @@
+import logging
+import cv2
+from .constants import *
+from .detection import FaceDetector
+from .embedding import ArcFaceEmbedder
+
+def crop_largest_face(img, detector, embedder):
+    boxes, landmarks = detector.detect(img)
+    if not len(boxes):
+        return embedder.preprocess(img)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    k = int(areas.argmax())
+    return embedder.crop_faces(img, boxes[k:k + 1], landmarks[k:k + 1] if landmarks is not None else None)[0]
+
+def embed_face_images(paths, detector, embedder):
+    crops = []
+    for path in paths:
+        try:
+            img = cv2.imread(path)
+            crops.append(crop_largest_face(img, detector, embedder) if img is not None else None)
+        except Exception as e:
+            logging.error(f"Error reading face image {path}: {e}")
+            crops.append(None)
+    embeddings, valid = embedder.embed_batch(crops)
+    return embeddings[valid], [p for p, ok in zip(paths, valid) if ok]
+
+def embed_image_files(paths, chunk_size=32):
+    detector = FaceDetector(YOLO_MODEL_PATH)
+    embedder = ArcFaceEmbedder()
+    results = {}
+    for start in range(0, len(paths), chunk_size):
+        embeddings, ok_paths = embed_face_images(paths[start:start + chunk_size], detector, embedder)
+        results.update(zip(ok_paths, embeddings))
+    return results
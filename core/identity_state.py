@@ -0,0 +1,78 @@
+import time
+import threading
+from collections import deque, OrderedDict
+
+def _setting(name, default, cast):
+    from .admin_backend import AdminBackend
+    try:
+        return cast(AdminBackend.get_setting(name, str(default)))
+    except ValueError:
+        return default
+
+class IdentityState:
+    __slots__ = ("hits", "last_seen", "last_logged")
+
+    def __init__(self, confirm_count):
+        self.hits = deque(maxlen=confirm_count)
+        self.last_seen = 0.0
+        self.last_logged = None
+
+class IdentityStore:
+    # Per-identity recognition state for one session. An identity is confirmed by confirm_count hits within
+    # confirm_window seconds and logged at most once per log_interval. Entries idle for ttl are dropped and the
+    # least recently seen ones are evicted beyond max_identities, so memory stays flat over an all-day session.
+    def __init__(self, confirm_count=5, confirm_window=10.0, log_interval=120.0, ttl=900.0, max_identities=2000):
+        self.confirm_count = max(1, int(confirm_count))
+        self.confirm_window = confirm_window
+        self.log_interval = log_interval
+        # Forgetting an identity also forgets when it was logged, so it must outlive the log interval.
+        self.ttl = max(ttl, log_interval, confirm_window)
+        self.max_identities = max_identities
+        self.states = OrderedDict()
+        self.lock = threading.Lock()
+        self.clock = time.monotonic
+
+    @classmethod
+    def from_settings(cls, confirm_count=5, log_interval=120.0):
+        return cls(
+            confirm_count=confirm_count,
+            confirm_window=_setting("confirm_window_seconds", 10.0, float),
+            log_interval=log_interval,
+            ttl=_setting("identity_ttl_seconds", 900.0, float),
+            max_identities=_setting("identity_max", 2000, int),
+        )
+
+    def __len__(self):
+        return len(self.states)
+
+    def expire(self, now=None):
+        now = self.clock() if now is None else now
+        with self.lock:
+            self._expire(now)
+
+    def _expire(self, now):
+        # States are kept in last-seen order, so expired ones are always at the front.
+        while self.states:
+            key, state = next(iter(self.states.items()))
+            if now - state.last_seen <= self.ttl and len(self.states) <= self.max_identities:
+                break
+            del self.states[key]
+
+    def hit(self, key, now=None):
+        # Records one recognition of key; returns (confirmed, should_log). should_log is True once per log_interval.
+        now = self.clock() if now is None else now
+        with self.lock:
+            state = self.states.pop(key, None) or IdentityState(self.confirm_count)
+            self.states[key] = state
+            state.last_seen = now
+            state.hits.append(now)
+            self._expire(now)
+            confirmed = len(state.hits) == self.confirm_count and now - state.hits[0] <= self.confirm_window
+            if not confirmed:
+                return False, False
+            if state.last_logged is not None and now - state.last_logged < self.log_interval:
+                return True, False
+            state.last_logged = now
+            # Start a fresh window so the next log needs a new run of hits rather than one straggler.
+            state.hits.clear()
+            return True, True
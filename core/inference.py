@@ -0,0 +1,113 @@
+import os
+import logging
+import cv2
+import numpy as np
+from .constants import *
+from .detection import FaceDetector, letterbox_frame
+from .embedding import ArcFaceEmbedder
+
+BACKENDS = ("native", "onnx")
+
+def _setting(name, default):
+    from .admin_backend import AdminBackend
+    return str(AdminBackend.get_setting(name, default) or default).strip().lower()
+
+def inference_backend():
+    backend = _setting("inference_backend", "native")
+    return backend if backend in BACKENDS else "native"
+
+def onnx_threads():
+    try:
+        return max(0, int(_setting("onnx_threads", "0")))
+    except ValueError:
+        return 0
+
+def onnx_quantized():
+    return _setting("onnx_quantized", "0") in ("1", "true", "yes", "on")
+
+def quantized_path(path):
+    return os.path.splitext(path)[0] + ".int8.onnx"
+
+def onnx_model_path(path, quantized=None):
+    if quantized is None:
+        quantized = onnx_quantized()
+    return quantized_path(path) if quantized else path
+
+def onnx_session(model_path, threads=0, provider=None):
+    import onnxruntime as ort
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"{model_path} missing; run export_models.py first")
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+    providers = ["CPUExecutionProvider"]
+    provider = provider or _setting("onnx_provider", "cpu")
+    if provider == "openvino":
+        if "OpenVINOExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "OpenVINOExecutionProvider")
+        else:
+            logging.warning("OpenVINO execution provider not installed; using the ONNX Runtime CPU provider")
+    return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+
+class OnnxFaceDetector(FaceDetector):
+    # Runs the exported YOLOv8-face graph directly: raw (B, 5 + 3K, N) predictions, NMS done here.
+    def __init__(self, model_path, input_size=640, threads=0, conf=0.25, iou=0.45):
+        self.session = onnx_session(model_path, threads)
+        self.input_name = self.session.get_inputs()[0].name
+        # The exported graph always takes a letterboxed square; native-resolution mode does not apply.
+        self.input_size = input_size or 640
+        self.conf = conf
+        self.iou = iou
+
+    def _parse_raw(self, pred, frame, scale, left, top):
+        pred = pred.T
+        pred = pred[pred[:, 4] >= self.conf]
+        if not len(pred):
+            return np.empty((0, 4), dtype=int), None
+        cx, cy, w, h = pred[:, 0], pred[:, 1], pred[:, 2], pred[:, 3]
+        xywh = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+        keep = np.asarray(cv2.dnn.NMSBoxes(xywh.tolist(), pred[:, 4].tolist(), self.conf, self.iou), dtype=int).reshape(-1)
+        boxes = xywh[keep].copy()
+        boxes[:, 2:] += boxes[:, :2]
+        landmarks = None
+        if pred.shape[1] > 5:
+            landmarks = pred[keep, 5:].reshape(len(keep), -1, 3)[:, :, :2].astype(np.float32)
+        return self._to_source(boxes, landmarks, frame, scale, left, top)
+
+    def detect_batch(self, frames):
+        if not frames:
+            return []
+        boxed = [letterbox_frame(f, self.input_size) for f in frames]
+        blob = np.stack([cv2.cvtColor(b[0], cv2.COLOR_BGR2RGB) for b in boxed]).transpose(0, 3, 1, 2)
+        output = self.session.run(None, {self.input_name: np.ascontiguousarray(blob, dtype=np.float32) / 255.0})[0]
+        return [self._parse_raw(p, f, scale, left, top) for p, f, (_, scale, left, top) in zip(output, frames, boxed)]
+
+class OnnxEmbedder(ArcFaceEmbedder):
+    # Same preprocessing as the Keras model (NHWC, 0-1 floats); only the forward pass changes.
+    def __init__(self, model_path, threads=0):
+        self.session = onnx_session(model_path, threads)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_size = (int(model_input.shape[1]), int(model_input.shape[2]))
+        self.dim = int(self.session.get_outputs()[0].shape[-1])
+
+    def infer(self, batch):
+        return np.asarray(self.session.run(None, {self.input_name: batch})[0], dtype=np.float32)
+
+def load_detector(input_size=640, backend=None, quantized=None):
+    if (backend or inference_backend()) == "onnx":
+        try:
+            return OnnxFaceDetector(onnx_model_path(YOLO_ONNX_PATH, quantized), input_size, onnx_threads())
+        except Exception as e:
+            logging.error(f"ONNX detector unavailable, falling back to PyTorch: {e}")
+    return FaceDetector(YOLO_MODEL_PATH, input_size=input_size)
+
+def load_embedder(backend=None, quantized=None):
+    if (backend or inference_backend()) == "onnx":
+        try:
+            return OnnxEmbedder(onnx_model_path(ARCFACE_ONNX_PATH, quantized), onnx_threads())
+        except Exception as e:
+            logging.error(f"ONNX embedder unavailable, falling back to DeepFace: {e}")
+    return ArcFaceEmbedder()
@@ -0,0 +1,166 @@
+import json
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+from .utils import replace_file
+
+STAGES = ("grab", "detect", "embed", "classify", "timetable", "attendance_write", "paint")
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+class StageMetric:
+    # Cumulative bucket counts for scraping plus a window of recent samples for live percentiles.
+    def __init__(self, window=256):
+        self.samples = deque(maxlen=window)
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        self.samples.append(ms)
+        self.count += 1
+        self.total += ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def snapshot(self):
+        recent = np.fromiter(self.samples, dtype=np.float64)
+        out = {"count": self.count, "total_ms": round(self.total, 3)}
+        if len(recent):
+            p50, p95, p99 = np.percentile(recent, (50, 95, 99))
+            out.update({"last_ms": round(float(recent[-1]), 3), "mean_ms": round(float(recent.mean()), 3), "p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3)})
+        return out
+
+class Metrics:
+    def __init__(self, window=256, rate_window=5.0):
+        self.window = window
+        self.rate_window = rate_window
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.events = {}
+        self.gauges = {}
+        self.started_at = time.time()
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            metric = self.stages.get(stage)
+            if metric is None:
+                metric = self.stages[stage] = StageMetric(self.window)
+            metric.observe(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, name, n=1):
+        now = time.monotonic()
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            events = self.events.setdefault(name, deque())
+            events.append((now, n))
+            while events and now - events[0][0] > self.rate_window:
+                events.popleft()
+
+    def rate(self, name):
+        # Events per second over the last rate_window seconds.
+        now = time.monotonic()
+        with self.lock:
+            events = self.events.get(name, ())
+            recent = [(t, n) for t, n in events if now - t <= self.rate_window]
+        if not recent:
+            return 0.0
+        return sum(n for _, n in recent) / max(now - recent[0][0], 1.0)
+
+    def gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def snapshot(self):
+        with self.lock:
+            stages = {name: m.snapshot() for name, m in self.stages.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        return {
+            "time": time.time(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "stages": stages,
+            "counters": counters,
+            "rates": {name: round(self.rate(name), 2) for name in counters},
+            "gauges": gauges,
+        }
+
+    def prometheus(self, prefix="attendance"):
+        # Prometheus text exposition format.
+        with self.lock:
+            stages = {name: (list(m.buckets), m.count, m.total) for name, m in self.stages.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        lines = [f"# TYPE {prefix}_stage_ms histogram"]
+        for name, (buckets, count, total) in sorted(stages.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS_MS + ("+Inf",), buckets):
+                cumulative += n
+                lines.append(f'{prefix}_stage_ms_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_ms_sum{{stage="{name}"}} {total:.3f}')
+            lines.append(f'{prefix}_stage_ms_count{{stage="{name}"}} {count}')
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, value in sorted(gauges.items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def overlay_lines(self, stages=STAGES):
+        snap = self.snapshot()
+        rates, gauges = snap["rates"], snap["gauges"]
+        lines = [f"FPS {rates.get('frames_painted', 0):.1f} paint / {rates.get('frames_detected', 0):.1f} detect"
+                 f" | queue {gauges.get('queue_depth', 0)} | dropped {rates.get('frames_dropped', 0):.1f}/s | pending writes {gauges.get('attendance_pending', 0)}"]
+        parts = [f"{name} {snap['stages'][name]['p50_ms']:.0f}/{snap['stages'][name]['p95_ms']:.0f}" for name in stages if snap["stages"].get(name, {}).get("count")]
+        for i in range(0, len(parts), 4):
+            lines.append(("ms p50/p95: " if i == 0 else "") + "  ".join(parts[i:i + 4]))
+        return lines
+
+registry = Metrics()
+
+def metrics_file():
+    from .admin_backend import AdminBackend
+    return str(AdminBackend.get_setting("metrics_file", "") or "").strip()
+
+def overlay_enabled():
+    from .admin_backend import AdminBackend
+    return str(AdminBackend.get_setting("performance_overlay", "0")).strip().lower() in ("1", "true", "yes", "on")
+
+class MetricsWriter(threading.Thread):
+    # Dumps the registry to a JSON file every few seconds so it can be scraped without the HTTP service.
+    def __init__(self, path, interval=5.0, metrics=None):
+        super().__init__(daemon=True, name="metrics-writer")
+        self.path = path
+        self.interval = interval
+        self.metrics = metrics or registry
+        self.stop_event = threading.Event()
+
+    def write(self):
+        payload = json.dumps(self.metrics.snapshot(), indent=2).encode("utf-8")
+        replace_file(self.path, lambda f: f.write(payload))
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write()
+            except Exception as e:
+                logging.error(f"Error writing metrics file: {e}")
+
+    def stop(self):
+        self.stop_event.set()
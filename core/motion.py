@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+def _setting(name, default, cast):
+    from .admin_backend import AdminBackend
+    try:
+        return cast(AdminBackend.get_setting(name, str(default)))
+    except ValueError:
+        return default
+
+class MotionGate:
+    # Decides per frame whether the detector needs to run. The reference frame only moves on detection,
+    # so slow drift (lighting, someone sitting down) still adds up to a trigger.
+    def __init__(self, threshold=0.02, pixel_delta=18, keyframe_interval=15, frame_budget=1 / 15, max_stride=8, size=(80, 60)):
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.keyframe_interval = keyframe_interval
+        self.frame_budget = frame_budget
+        self.max_stride = max_stride
+        self.size = size
+        self.reference = None
+        self.since_detect = 0
+        self.stride = 1
+        self.latency = None
+        self.skipped = 0
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            threshold=_setting("motion_threshold", 0.02, float),
+            keyframe_interval=_setting("keyframe_interval", 15, int),
+            frame_budget=_setting("frame_budget_ms", 66, float) / 1000.0,
+        )
+
+    def downscale(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+    def changed_fraction(self, small):
+        if self.reference is None:
+            return 1.0
+        return float(np.count_nonzero(cv2.absdiff(small, self.reference) > self.pixel_delta)) / small.size
+
+    def should_detect(self, frame):
+        small = self.downscale(frame)
+        self.since_detect += 1
+        keyframe = self.reference is None or self.since_detect >= self.keyframe_interval
+        moved = self.since_detect >= self.stride and self.changed_fraction(small) >= self.threshold
+        if keyframe or moved:
+            self.reference = small
+            self.since_detect = 0
+            return True
+        self.skipped += 1
+        return False
+
+    def record_latency(self, seconds):
+        # Back off when detection cannot keep up with the frame budget, recover once it has headroom again.
+        self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+        if self.latency > 1.2 * self.frame_budget:
+            self.stride = min(self.max_stride, self.stride + 1)
+        elif self.latency < 0.6 * self.frame_budget:
+            self.stride = max(1, self.stride - 1)
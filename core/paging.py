@@ -0,0 +1,169 @@
+import io
+import os
+import csv
+import threading
+from .attendance_store import get_store
+
+def row_matches(row, text):
+    text = text.lower()
+    return any(text in str(value).lower() for value in row.values())
+
+# Rows the backend already holds in memory (students, archived sessions).
+class ListSource:
+    def __init__(self, load):
+        self.load = load
+        self._rows = None
+        self._filter_key = None
+        self._filtered = None
+        self._view_key = None
+        self._view = None
+
+    def refresh(self):
+        self._rows = None
+        self._filter_key = None
+        self._view_key = None
+
+    def _filter(self, text):
+        if self._rows is None:
+            self._rows = self.load()
+        if text != self._filter_key:
+            self._filtered = [r for r in self._rows if row_matches(r, text)] if text else self._rows
+            self._filter_key = text
+        return self._filtered
+
+    def _select(self, sort, descending, text):
+        rows = self._filter(text)
+        key = (sort, descending, text)
+        if key != self._view_key:
+            if sort:
+                rows = sorted(rows, key=lambda r: str(r.get(sort, "")).lower(), reverse=descending)
+            elif descending:
+                rows = rows[::-1]
+            self._view_key, self._view = key, rows
+        return self._view
+
+    def count(self, text=""):
+        return len(self._filter(text))
+
+    def fetch(self, offset, limit, sort=None, descending=False, text=""):
+        return self._select(sort, descending, text)[offset:offset + limit]
+
+# Live sessions page straight out of SQLite; archived sessions fall back to a list.
+class SessionSource:
+    def __init__(self, session):
+        self.session = session
+        self._archived = None
+
+    def refresh(self):
+        self._archived = None
+
+    def _archive(self):
+        if self._archived is None and get_store().is_archived(self.session):
+            from .attendance_archive import archived_session_rows
+            self._archived = ListSource(lambda: archived_session_rows(self.session))
+        return self._archived
+
+    def count(self, text=""):
+        archive = self._archive()
+        return archive.count(text) if archive else get_store().count_session_rows(self.session, text)
+
+    def fetch(self, offset, limit, sort=None, descending=False, text=""):
+        archive = self._archive()
+        if archive:
+            return archive.fetch(offset, limit, sort, descending, text)
+        return get_store().page_session_rows(self.session, offset, limit, sort, descending, text)
+
+def read_record(f):
+    # One CSV record as bytes; quoted fields may span lines, so a record ends at the first newline
+    # with balanced quotes. Returns None at EOF or on a record still being written.
+    record = b""
+    for line in iter(f.readline, b""):
+        record += line
+        if not line.endswith(b"\n"):
+            break
+        if record.count(b'"') % 2 == 0:
+            return record
+    if record:
+        f.seek(-len(record), os.SEEK_CUR)
+    return None
+
+# Append-only CSVs (system logs) are paged by seeking to indexed record offsets. The first column is
+# assumed to be in file order so sorting on it needs no scan.
+class CsvFileSource:
+    def __init__(self, path, headers):
+        self.path = path
+        self.headers = list(headers)
+        self.lock = threading.Lock()
+        self._offsets = []
+        self._indexed_to = 0
+        self._signature = None
+        self._views = {}
+
+    def refresh(self):
+        with self.lock:
+            self._views = {}
+
+    def _index(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._offsets, self._indexed_to, self._signature, self._views = [], 0, None, {}
+            return
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if signature == self._signature:
+            return
+        if self._signature is None or st.st_ino != self._signature[0] or st.st_size < self._indexed_to:
+            self._offsets, self._indexed_to = [], 0
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed_to)
+            if self._indexed_to == 0:
+                f.readline()
+            pos = f.tell()
+            while True:
+                record = read_record(f)
+                if record is None:
+                    break
+                if record.strip():
+                    self._offsets.append(pos)
+                pos += len(record)
+            self._indexed_to = pos
+        self._signature = signature
+        self._views = {}
+
+    def _read(self, f, offset):
+        f.seek(offset)
+        values = next(csv.reader(io.StringIO((read_record(f) or b"").decode("utf-8"))), [])
+        return dict(zip(self.headers, values + [""] * (len(self.headers) - len(values))))
+
+    def _select(self, sort, descending, text):
+        self._index()
+        if sort in (None, self.headers[0]) and not text and not descending:
+            return self._offsets
+        key = (sort, descending, text)
+        if key not in self._views and sort in (None, self.headers[0]) and not text:
+            self._views[key] = self._offsets[::-1]
+        if key not in self._views:
+            matched = []
+            with open(self.path, "rb") as f:
+                for offset in self._offsets:
+                    row = self._read(f, offset)
+                    if not text or row_matches(row, text):
+                        matched.append((str(row.get(sort, "")).lower() if sort else "", offset))
+            if sort:
+                matched.sort(key=lambda item: item[0], reverse=descending)
+            elif descending:
+                matched.reverse()
+            self._views[key] = [offset for _, offset in matched]
+        return self._views[key]
+
+    def count(self, text=""):
+        with self.lock:
+            return len(self._select(None, False, text))
+
+    def fetch(self, offset, limit, sort=None, descending=False, text=""):
+        with self.lock:
+            offsets = self._select(sort, descending, text)[offset:offset + limit]
+            if not offsets:
+                return []
+            with open(self.path, "rb") as f:
+                return [self._read(f, o) for o in offsets]
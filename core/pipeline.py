@@ -0,0 +1,110 @@
+import os
+import time
+import queue
+import threading
+import logging
+import cv2
+from .utils import list_face_images
+from .metrics import registry
+
+class DropOldestQueue(queue.Queue):
+    def __init__(self, maxsize=1):
+        super().__init__(maxsize=maxsize)
+        self.dropped = 0
+
+    def put_latest(self, item):
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get_latest(self, default=None):
+        item = default
+        while True:
+            try:
+                item = self.get_nowait()
+            except queue.Empty:
+                return item
+
+class CaptureWorker(threading.Thread):
+    def __init__(self, source, outputs, name="capture"):
+        super().__init__(daemon=True, name=name)
+        self.source = source
+        self.outputs = outputs
+        self.stop_event = threading.Event()
+        self.cap = None
+        # Video files are paced at their own frame rate and end at EOF; cameras and streams are read as fast as they deliver.
+        self.is_file = isinstance(source, str) and os.path.isfile(source)
+
+    def run(self):
+        self.cap = cv2.VideoCapture(self.source)
+        interval = 1.0 / (self.cap.get(cv2.CAP_PROP_FPS) or 25.0) if self.is_file else 0.0
+        try:
+            while not self.stop_event.is_set():
+                started = time.monotonic()
+                ret, frame = self.cap.read()
+                registry.observe("grab", time.monotonic() - started)
+                if not ret:
+                    if self.is_file:
+                        break
+                    self.stop_event.wait(0.05)
+                    continue
+                for q in self.outputs:
+                    q.put_latest(frame)
+                if interval:
+                    self.stop_event.wait(max(0.0, interval - (time.monotonic() - started)))
+        except Exception as e:
+            logging.error(f"Capture error ({self.source}): {e}")
+        finally:
+            if self.cap.isOpened():
+                self.cap.release()
+
+    def stop(self):
+        self.stop_event.set()
+
+class ImageFolderWorker(threading.Thread):
+    # Treats a folder as a drop box: every image is emitted once, and new arrivals are picked up on rescan.
+    # Unlike a camera, images must not be dropped, so it waits for the inference queue to drain first.
+    def __init__(self, folder, outputs, drain=None, interval=0.5, rescan=1.0, name="image-folder"):
+        super().__init__(daemon=True, name=name)
+        self.folder = folder
+        self.outputs = outputs
+        self.drain = drain
+        self.interval = interval
+        self.rescan = rescan
+        self.stop_event = threading.Event()
+        self.seen = set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            new = [p for p in list_face_images(self.folder) if p not in self.seen]
+            if not new:
+                self.stop_event.wait(self.rescan)
+                continue
+            for path in new:
+                if self.stop_event.is_set():
+                    break
+                while self.drain is not None and self.drain.full() and not self.stop_event.is_set():
+                    self.stop_event.wait(0.02)
+                self.seen.add(path)
+                frame = cv2.imread(path)
+                if frame is None:
+                    logging.error(f"Could not read image {path}")
+                    continue
+                for q in self.outputs:
+                    q.put_latest(frame)
+                self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+def open_source(source, outputs, drain=None, name="capture"):
+    if isinstance(source, str) and os.path.isdir(source):
+        return ImageFolderWorker(source, outputs, drain=drain, name=name)
+    return CaptureWorker(source, outputs, name=name)
@@ -0,0 +1,231 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+from .constants import *
+from . import repository
+from .detection import detection_size
+from .inference import load_detector, load_embedder, inference_backend
+from .recognizers import load_recognizer
+from .tracking import IoUTracker, UNKNOWN
+from .identity_state import IdentityStore
+from .attendance_logging import log_attendance
+from .utils import normalize
+from .timetable import get_timetable
+from .startup import timer
+from .metrics import registry
+
+RECOGNIZED_COLOR = (0, 255, 0)
+UNKNOWN_COLOR = (0, 0, 255)
+
+def load_students():
+    students = {}
+    student_info = {}
+    try:
+        for row in repository.students.all():
+            prn = str(row.get("PRN", "")).strip()
+            students[normalize(prn)] = row
+            students[normalize(row.get("Name", ""))] = row
+            student_info[normalize(prn)] = {
+                "Sr No.": "",
+                "PRN": prn,
+                "Student Name": row.get("Name", ""),
+                "Class": row.get("Class", ""),
+                "Division": row.get("Division", ""),
+                "Batch": row.get("Batch", ""),
+                "Label": prn
+            }
+    except Exception as e:
+        logging.error(f"Error loading students.csv: {e}")
+    return students, student_info
+
+def annotate(frame, detections, scale=(1.0, 1.0)):
+    sx, sy = scale
+    for det in detections:
+        x1, y1, x2, y2 = (int(round(v * f)) for v, f in zip(det["box"], (sx, sy, sx, sy)))
+        cv2.rectangle(frame, (x1, y1), (x2, y2), det["color"], 2)
+        cv2.putText(frame, det["label"], (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, det["color"], 2)
+    return frame
+
+class RecognitionModels:
+    # Detector, embedder and recognizer are loaded once and shared by every camera's engine.
+    def __init__(self, threshold=None):
+        if not os.path.exists(YOLO_MODEL_PATH):
+            raise FileNotFoundError("YOLO model file missing")
+        self.threshold = threshold
+        self.lock = threading.RLock()
+        backend = inference_backend()
+        with timer.stage(f"load YOLO detector ({backend})"):
+            self.detector = load_detector(detection_size(), backend)
+        with timer.stage(f"load ArcFace embedder ({backend})"):
+            self.embedder = load_embedder(backend)
+        with timer.stage("load recognizer"):
+            self.recognizer = load_recognizer(threshold=threshold)
+        self.recognizer_mtime = self.model_mtime()
+        self.last_reload_check = time.monotonic()
+
+    def warm_up(self):
+        # The first call into each framework pays for graph building and allocation; do it before the camera needs it.
+        with timer.stage("warm-up inference"), self.lock:
+            self.detector.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+            self.embedder.embed_batch([np.zeros((*self.embedder.input_size, 3), dtype=np.uint8)])
+
+    def model_mtime(self):
+        try:
+            return os.path.getmtime(self.recognizer.path)
+        except (OSError, TypeError):
+            return None
+
+    def refresh_recognizer(self, interval=1.0):
+        now = time.monotonic()
+        if now - self.last_reload_check < interval:
+            return
+        self.last_reload_check = now
+        mtime = self.model_mtime()
+        if mtime is None or mtime == self.recognizer_mtime:
+            return
+        try:
+            self.recognizer = load_recognizer(threshold=self.threshold)
+            self.recognizer_mtime = self.model_mtime()
+        except Exception as e:
+            logging.error(f"Error reloading recognizer: {e}")
+            self.recognizer_mtime = mtime
+
+    def detect_batch(self, frames):
+        with registry.time("detect"):
+            detections = self.detector.detect_batch(frames)
+        registry.count("frames_detected", len(frames))
+        return detections
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+    def embed(self, crops):
+        if not len(crops):
+            return self.embedder.embed_batch(crops)
+        with registry.time("embed"):
+            return self.embedder.embed_batch(crops)
+
+    def predict(self, embeddings, valid):
+        results = [(UNKNOWN, 0.0)] * len(valid)
+        if valid.any():
+            with registry.time("classify"):
+                predicted, probs = self.recognizer.predict(embeddings[valid])
+            for i, label, prob in zip(np.flatnonzero(valid), predicted, probs):
+                results[i] = (label if prob >= self.recognizer.threshold else UNKNOWN, float(prob))
+        return results
+
+    def classify(self, crops):
+        if not crops:
+            return []
+        try:
+            return self.predict(*self.embed(crops))
+        except Exception as e:
+            logging.error(f"Face recognition error: {e}")
+            return [(UNKNOWN, 0.0)] * len(crops)
+
+class RecognitionEngine:
+    # Per-camera state: session, tracker and logging window. Inference goes through the shared models.
+    def __init__(self, session, face_confirm_count=5, time_window=timedelta(minutes=2), threshold=None, reverify_every=30, reverify_confidence=None, on_attendance=None, models=None, gate=None):
+        self.session = session
+        self.gate = gate
+        self.last_result = {"detections": [], "names": []}
+        self.on_attendance = on_attendance
+        self.face_confirm_count = face_confirm_count
+        self.time_window = time_window
+        self.models = models or RecognitionModels(threshold)
+        self.students, self.student_info = load_students()
+        # Without an explicit cutoff, a track is re-checked early only if it falls below the recognizer's own acceptance
+        # threshold; a fixed cutoff above typical SVM probabilities would re-embed most confirmed faces every frame.
+        self.reverify_confidence = reverify_confidence
+        self.tracker = IoUTracker(reverify_every=reverify_every, min_confidence=self.reverify_cutoff())
+        self.identities = IdentityStore.from_settings(face_confirm_count, time_window.total_seconds())
+
+    def match_timetable_for_student(self, student, ts):
+        if not student:
+            return {}
+        return get_timetable().lookup(ts.strftime("%A"), student.get("Division", ""), student.get("Batch", ""), ts)
+
+    def confirm(self, track):
+        # Hits count per identity, not per track, so a face that drops out and is re-tracked keeps its window.
+        if track.label == UNKNOWN:
+            return
+        key = normalize(track.label)
+        confirmed, should_log = self.identities.hit(key)
+        if confirmed:
+            track.confirmed = True
+        if should_log:
+            self.log(key, datetime.now())
+
+    def log(self, key, now):
+        student = self.student_info.get(key, None)
+        if student:
+            log_attendance(self.session, student["PRN"], student["Student Name"], self.students)
+            if self.on_attendance:
+                self.on_attendance(student, now)
+
+    def reverify_cutoff(self):
+        if self.reverify_confidence is not None:
+            return self.reverify_confidence
+        return float(getattr(self.models.recognizer, "threshold", 0.0) or 0.0)
+
+    def begin(self, frame, boxes, landmarks):
+        # Update tracks and crop only the faces that still need a recognizer pass.
+        self.tracker.min_confidence = self.reverify_cutoff()
+        tracks = self.tracker.update(boxes)
+        pending = np.array([i for i, t in enumerate(tracks) if self.tracker.needs_verification(t)], dtype=int)
+        crops = []
+        if len(pending):
+            crops = self.models.embedder.crop_faces(frame, boxes[pending], landmarks[pending] if landmarks is not None else None)
+        return tracks, pending, crops
+
+    def finish(self, boxes, tracks, pending, results):
+        for i, (label, prob) in zip(pending, results):
+            self.tracker.verify(tracks[i], label, prob)
+            self.confirm(tracks[i])
+        # A confirmed track keeps its label between re-verifications, so each tracked frame still counts as a hit;
+        # otherwise a student who stays in view could never be re-confirmed once log_interval has passed.
+        verified = set(int(i) for i in pending)
+        for i, track in enumerate(tracks):
+            if i not in verified and track.confirmed:
+                self.confirm(track)
+        detections = []
+        for (x1, y1, x2, y2), track in zip(boxes, tracks):
+            color = UNKNOWN_COLOR if track.label == UNKNOWN else RECOGNIZED_COLOR
+            detections.append({"box": (int(x1), int(y1), int(x2), int(y2)), "label": track.label, "color": color, "track_id": track.track_id})
+        self.last_result = {"detections": detections, "names": [t.label for t in tracks]}
+        return self.last_result
+
+    def should_detect(self, frame):
+        return self.gate is None or self.gate.should_detect(frame)
+
+    def record_latency(self, seconds):
+        if self.gate is not None:
+            self.gate.record_latency(seconds)
+
+    def identify(self, frame):
+        # One-shot recognition for still images: no tracking, so nothing is confirmed or logged.
+        with self.models.lock:
+            self.models.refresh_recognizer()
+            boxes, landmarks = self.models.detect(frame)
+            results = self.models.classify(self.models.embedder.crop_faces(frame, boxes, landmarks))
+        return [
+            {"box": (int(x1), int(y1), int(x2), int(y2)), "label": label, "confidence": prob}
+            for (x1, y1, x2, y2), (label, prob) in zip(boxes, results)
+        ]
+
+    def process(self, frame):
+        if not self.should_detect(frame):
+            return self.last_result
+        started = time.monotonic()
+        with self.models.lock:
+            self.models.refresh_recognizer()
+            boxes, landmarks = self.models.detect(frame)
+            tracks, pending, crops = self.begin(frame, boxes, landmarks)
+            results = self.models.classify(crops)
+            result = self.finish(boxes, tracks, pending, results)
+        self.record_latency(time.monotonic() - started)
+        return result
@@ -0,0 +1,154 @@
+import os
+import numpy as np
+from .constants import EMBEDDINGS_NPZ, SVM_MODEL_PATH
+from .utils import replace_file
+
+class SVMRecognizer:
+    def __init__(self, model_path, threshold=0.2):
+        import joblib
+        self.path = model_path
+        self.clf = joblib.load(model_path)
+        self.classes = np.asarray(self.clf.classes_)
+        self.threshold = threshold
+
+    def predict(self, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not len(embeddings):
+            return [], np.zeros(0, dtype=np.float32)
+        proba = self.clf.predict_proba(embeddings)
+        best = proba.argmax(axis=1)
+        labels = [str(label).strip() for label in self.classes[best]]
+        return labels, proba[np.arange(len(best)), best]
+
+def l2_normalize(x):
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x.reshape(1, -1)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+class EmbeddingIndex:
+    def __init__(self, embeddings=None, labels=None, threshold=0.35, ivf_min_size=20000, nprobe=8):
+        self.path = None
+        self.threshold = threshold
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self.size = 0
+        self.matrix = None
+        self.row_label = np.zeros(0, dtype=np.int32)
+        self.label_names = []
+        self.label_ids = {}
+        self.centroids = None
+        # Row indices of each inverted list, so a query only touches the lists it probes.
+        self.lists = []
+        if embeddings is not None and len(embeddings):
+            self.add(labels, embeddings)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with np.load(path) as data:
+            index = cls(data["X"], data["y"], **kwargs)
+        index.path = path
+        return index
+
+    def save(self, path):
+        labels = np.asarray(self.label_names, dtype=str)[self.row_label[:self.size]] if self.size else np.zeros(0, dtype=str)
+        matrix = self.matrix[:self.size] if self.size else np.zeros((0, 0), dtype=np.float32)
+        replace_file(path, lambda f: np.savez(f, X=matrix, y=labels))
+
+    def _label_id(self, label):
+        label = str(label).strip()
+        if label not in self.label_ids:
+            self.label_ids[label] = len(self.label_names)
+            self.label_names.append(label)
+        return self.label_ids[label]
+
+    def _reserve(self, dim, capacity):
+        if self.matrix is None:
+            self.matrix = np.zeros((max(capacity, 64), dim), dtype=np.float32)
+            self.row_label = np.zeros(len(self.matrix), dtype=np.int32)
+        elif capacity > len(self.matrix):
+            new_capacity = max(capacity, 2 * len(self.matrix))
+            matrix = np.zeros((new_capacity, self.matrix.shape[1]), dtype=np.float32)
+            matrix[:self.size] = self.matrix[:self.size]
+            self.matrix = matrix
+            self.row_label = np.resize(self.row_label, new_capacity)
+
+    def add(self, labels, embeddings):
+        embeddings = l2_normalize(embeddings)
+        n = len(embeddings)
+        if not n:
+            return
+        if isinstance(labels, str):
+            labels = [labels] * n
+        self._reserve(embeddings.shape[1], self.size + n)
+        start, end = self.size, self.size + n
+        self.matrix[start:end] = embeddings
+        self.row_label[start:end] = [self._label_id(label) for label in labels]
+        if self.centroids is not None:
+            assign = (embeddings @ self.centroids.T).argmax(axis=1)
+            for c in np.unique(assign):
+                self.lists[c] = np.concatenate([self.lists[c], start + np.flatnonzero(assign == c)])
+        self.size = end
+        if self.centroids is None and self.size >= self.ivf_min_size:
+            self.build_ivf()
+
+    def build_ivf(self, nlist=None, iterations=10):
+        data = self.matrix[:self.size]
+        nlist = min(nlist or int(np.sqrt(self.size)), self.size)
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(self.size, nlist, replace=False)]
+        for _ in range(iterations):
+            assign = (data @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            counts = np.bincount(assign, minlength=nlist)
+            nonempty = counts > 0
+            centroids[nonempty] = l2_normalize(sums[nonempty])
+        self.centroids = centroids
+        assign = (data @ centroids.T).argmax(axis=1)
+        order = np.argsort(assign, kind="stable")
+        self.lists = np.split(order, np.cumsum(np.bincount(assign, minlength=nlist))[:-1])
+
+    def search(self, queries):
+        queries = l2_normalize(queries)
+        if not self.size:
+            return np.full(len(queries), -1), np.zeros(len(queries), dtype=np.float32)
+        data = self.matrix[:self.size]
+        if self.centroids is None:
+            sims = queries @ data.T
+            best = sims.argmax(axis=1)
+            return best, sims[np.arange(len(best)), best]
+        rows = np.zeros(len(queries), dtype=int)
+        scores = np.zeros(len(queries), dtype=np.float32)
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :self.nprobe]
+        for i, query in enumerate(queries):
+            candidates = np.concatenate([self.lists[c] for c in probes[i]])
+            if not len(candidates):
+                # Every probed list is empty (k-means can leave clusters unused); fall back to a full scan.
+                candidates = np.arange(self.size)
+            sims = data[candidates] @ query
+            best = sims.argmax()
+            rows[i], scores[i] = candidates[best], sims[best]
+        return rows, scores
+
+    def predict(self, embeddings):
+        if not len(embeddings):
+            return [], np.zeros(0, dtype=np.float32)
+        rows, scores = self.search(embeddings)
+        labels = ["Unknown" if r < 0 else self.label_names[self.row_label[r]] for r in rows]
+        return labels, scores
+
+def load_recognizer(backend=None, threshold=None):
+    from .admin_backend import AdminBackend
+    backend = (backend or AdminBackend.get_setting("recognizer_backend", "svm")).strip().lower()
+    if threshold is None:
+        threshold = AdminBackend.get_setting("recognizer_threshold")
+    kwargs = {"threshold": float(threshold)} if threshold else {}
+    if backend == "index":
+        if not os.path.exists(EMBEDDINGS_NPZ):
+            raise FileNotFoundError("Embedding gallery file missing")
+        return EmbeddingIndex.load(EMBEDDINGS_NPZ, **kwargs)
+    if not os.path.exists(SVM_MODEL_PATH):
+        raise FileNotFoundError("SVM model file missing")
+    return SVMRecognizer(SVM_MODEL_PATH, **kwargs)
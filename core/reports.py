@@ -0,0 +1,88 @@
+import os
+import csv
+import logging
+from datetime import datetime
+from .constants import *
+from .attendance_store import get_store, normalize_legacy_row, session_started_at
+from .attendance_archive import iter_archive_rows
+
+def subject_matches(subject, needle):
+    return not needle or needle.lower() in (subject or "").lower()
+
+def filter_rows(rows, subject=None, from_date=None, to_date=None):
+    for row in rows:
+        date = row.get("Date", "")
+        if from_date and date < from_date:
+            continue
+        if to_date and date > to_date:
+            continue
+        if not subject_matches(row.get("Subject", ""), subject):
+            continue
+        yield row
+
+def file_in_range(path, from_date=None, to_date=None):
+    # A session's rows fall between its start (from the filename) and its last write (mtime).
+    name = os.path.splitext(os.path.basename(path))[0]
+    last_write = datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+    started = session_started_at(name, last_write)[:10]
+    if to_date and started > to_date:
+        return False
+    if from_date and last_write < from_date:
+        return False
+    return True
+
+def _read_log_file(path, subject=None, from_date=None, to_date=None):
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = (r for r in (normalize_legacy_row(row) for row in csv.DictReader(f)) if r)
+            return list(filter_rows(rows, subject, from_date, to_date))
+    except Exception as e:
+        logging.error(f"Error reading attendance log {path}: {e}")
+        return []
+
+def pending_log_files(log_dir=ATTENDANCE_DIR, from_date=None, to_date=None):
+    if not os.path.isdir(log_dir):
+        return []
+    done = get_store().migrated_files()
+    paths = [os.path.join(log_dir, f) for f in sorted(os.listdir(log_dir)) if f.endswith(".csv") and f not in done]
+    return [p for p in paths if file_in_range(p, from_date, to_date)]
+
+def iter_report_rows(subject=None, from_date=None, to_date=None, log_dir=ATTENDANCE_DIR):
+    yield from iter_archive_rows(subject, from_date, to_date)
+    yield from get_store().iter_query(subject, from_date, to_date)
+    # CSV logs are moved into SQLite at startup, so only files that failed to migrate are left to read here.
+    for path in pending_log_files(log_dir, from_date, to_date):
+        yield from _read_log_file(path, subject, from_date, to_date)
+
+def write_report(path, rows, progress=None, cancelled=None, every=500):
+    # Rows go to a temporary file that only replaces path once complete; a cancelled or failed export
+    # leaves whatever was at path untouched and returns None, an empty one leaves it untouched and returns 0.
+    count = 0
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=ATTENDANCE_HEADERS, extrasaction="ignore")
+            writer.writeheader()
+            for count, row in enumerate(rows, 1):
+                writer.writerow({**row, "Sr No.": count})
+                if count % every == 0:
+                    if progress:
+                        progress(count)
+                    if cancelled and cancelled():
+                        os.remove(tmp_path)
+                        return None
+        if not count:
+            # No matching rows: keep whatever report was already at path.
+            os.remove(tmp_path)
+            return 0
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if progress:
+        progress(count)
+    return count
+
+def export_report(path, subject=None, from_date=None, to_date=None, progress=None, cancelled=None):
+    return write_report(path, iter_report_rows(subject, from_date, to_date), progress, cancelled)
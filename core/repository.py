@@ -0,0 +1,144 @@
+import io
+import os
+import csv
+import logging
+import threading
+from .constants import *
+from .utils import replace_file
+
+class CsvRepository:
+    def __init__(self, path, headers, key):
+        self.path = path
+        self.headers = list(headers)
+        self.key = key
+        self.fieldnames = list(headers)
+        self.lock = threading.RLock()
+        self._rows = []
+        self._index = {}
+        self._signature = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        signature = self._stat()
+        if signature is not None and signature == self._signature:
+            return
+        if signature is None:
+            self._rows, self._index = [], {}
+            self.fieldnames = list(self.headers)
+            self._write()
+            return
+        try:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                rows = [{k: (v if v is not None else "") for k, v in row.items() if k is not None} for row in reader]
+                fieldnames = reader.fieldnames or []
+        except Exception as e:
+            logging.error(f"Error reading {self.path}: {e}")
+            return
+        self.fieldnames = fieldnames + [h for h in self.headers if h not in fieldnames]
+        self._rows = rows
+        self._index = {row.get(self.key, ""): row for row in rows}
+        self._signature = signature
+
+    def _write(self):
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=self.fieldnames, extrasaction="ignore", restval="")
+        writer.writeheader()
+        writer.writerows(self._rows)
+        try:
+            replace_file(self.path, lambda f: f.write(out.getvalue().encode("utf-8")))
+        except Exception as e:
+            logging.error(f"Error writing {self.path}: {e}")
+        self._signature = self._stat()
+
+    def all(self):
+        with self.lock:
+            self._load()
+            return [dict(row) for row in self._rows]
+
+    def count(self):
+        with self.lock:
+            self._load()
+            return len(self._rows)
+
+    def get(self, key):
+        with self.lock:
+            self._load()
+            row = self._index.get(key)
+            return dict(row) if row is not None else None
+
+    def append(self, row):
+        self.extend([row])
+
+    def extend(self, rows):
+        rows = [dict(row) for row in rows]
+        if not rows:
+            return
+        with self.lock:
+            self._load()
+            out = io.StringIO()
+            writer = csv.DictWriter(out, fieldnames=self.fieldnames, extrasaction="ignore", restval="")
+            writer.writerows(rows)
+            try:
+                with open(self.path, "rb") as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size:
+                        f.seek(-1, os.SEEK_END)
+                    needs_newline = size > 0 and f.read(1) != b"\n"
+                with open(self.path, "a", newline="", encoding="utf-8") as f:
+                    f.write(("\r\n" if needs_newline else "") + out.getvalue())
+            except Exception as e:
+                logging.error(f"Error appending to {self.path}: {e}")
+                return
+            for row in rows:
+                self._rows.append(row)
+                self._index[row.get(self.key, "")] = row
+            self._signature = self._stat()
+
+    def put(self, row):
+        with self.lock:
+            self._load()
+            existing = self._index.get(row.get(self.key, ""))
+            if existing is None:
+                self.append(row)
+                return
+            existing.update(row)
+            self._write()
+
+    def update(self, key, changes):
+        with self.lock:
+            self._load()
+            if key not in self._index:
+                return False
+            for row in self._rows:
+                if row.get(self.key, "") == key:
+                    row.update(changes)
+            self._write()
+            return True
+
+    def delete(self, key):
+        with self.lock:
+            self._load()
+            if key not in self._index:
+                return False
+            self._rows = [row for row in self._rows if row.get(self.key, "") != key]
+            del self._index[key]
+            self._write()
+            return True
+
+    def replace_all(self, rows):
+        with self.lock:
+            self._load()
+            self._rows = [dict(row) for row in rows]
+            self._index = {row.get(self.key, ""): row for row in self._rows}
+            self._write()
+
+users = CsvRepository(USERS_CSV, ["username", "password", "role"], "username")
+students = CsvRepository(STUDENTS_CSV, ["PRN", "Name", "Class", "Division", "Batch"], "PRN")
+settings = CsvRepository(SETTINGS_CSV, ["key", "value"], "key")
@@ -0,0 +1,213 @@
+import json
+import time
+import queue
+import logging
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import cv2
+import numpy as np
+from .attendance_logging import start_session, end_session
+from .cameras import CameraManager
+from .metrics import registry
+from .motion import MotionGate
+from .pipeline import DropOldestQueue
+from .recognition import RecognitionEngine, RecognitionModels
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+class EventBroker:
+    def __init__(self, backlog=100):
+        self.backlog = backlog
+        self.lock = threading.Lock()
+        self.subscribers = []
+
+    def subscribe(self):
+        q = DropOldestQueue(maxsize=self.backlog)
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def publish(self, kind, data):
+        event = {"type": kind, "time": datetime.now().isoformat(sep=" ", timespec="seconds"), **data}
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            q.put_latest(event)
+
+class RecognitionService:
+    def __init__(self, sources=()):
+        self.session = start_session("api")
+        self.events = EventBroker()
+        self.roster = {}
+        self.roster_lock = threading.Lock()
+        self.models = RecognitionModels()
+        # Frames posted to the API form their own stream with its own tracker; the lock keeps concurrent posts in order.
+        self.engine_lock = threading.Lock()
+        self.engine = RecognitionEngine(self.session, on_attendance=lambda student, ts: self.on_attendance("api", student, ts), models=self.models, gate=MotionGate.from_settings())
+        self.frames_processed = 0
+        self.started_at = time.time()
+        self.cameras = CameraManager(sources, models=self.models, on_attendance=self.on_attendance) if sources else None
+        self.results_thread = None
+        self.running = False
+
+    def on_attendance(self, source, student, ts):
+        entry = {"prn": student["PRN"], "name": student["Student Name"], "division": student.get("Division", ""), "source": source, "time": ts.isoformat(sep=" ", timespec="seconds")}
+        with self.roster_lock:
+            seen = self.roster.get(entry["prn"])
+            entry["first_seen"] = seen["first_seen"] if seen else entry["time"]
+            entry["count"] = (seen["count"] if seen else 0) + 1
+            self.roster[entry["prn"]] = entry
+        self.events.publish("attendance", entry)
+
+    def publish_result(self, source, result):
+        self.frames_processed += 1
+        detections = [{k: d[k] for k in ("box", "label", "track_id")} for d in result["detections"]]
+        if detections:
+            self.events.publish("recognition", {"source": source, "detections": detections})
+
+    def process(self, frame):
+        with self.engine_lock:
+            result = self.engine.process(frame)
+        self.publish_result("api", result)
+        return result
+
+    def identify(self, frame):
+        with self.engine_lock:
+            return self.engine.identify(frame)
+
+    def get_roster(self):
+        with self.roster_lock:
+            return sorted(self.roster.values(), key=lambda r: r["first_seen"])
+
+    def status(self):
+        return {
+            "session": self.session,
+            "frames_processed": self.frames_processed,
+            "uptime": round(time.time() - self.started_at, 1),
+            "identities": len(self.engine.identities),
+            "cameras": [{"name": c.name, "source": str(c.source), "session": c.session, "identities": len(c.engine.identities)} for c in self.cameras.cameras] if self.cameras else [],
+            "subscribers": len(self.events.subscribers),
+        }
+
+    def _forward_results(self):
+        while self.running:
+            for camera in self.cameras.cameras:
+                result = camera.result_queue.get_latest()
+                if result is not None:
+                    self.publish_result(camera.name, result)
+            time.sleep(0.05)
+
+    def start(self):
+        self.running = True
+        if self.cameras:
+            self.cameras.start()
+            self.results_thread = threading.Thread(target=self._forward_results, daemon=True, name="service-results")
+            self.results_thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.cameras:
+            self.cameras.stop()
+        end_session(self.session)
+
+def decode_image(data):
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Body is not a decodable image")
+    return frame
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s", self.address_string(), format % args)
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload, default=str).encode("utf-8"), "application/json")
+
+    def send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_UPLOAD_BYTES:
+            raise ValueError(f"Content-Length must be between 1 and {MAX_UPLOAD_BYTES} bytes")
+        return self.rfile.read(length)
+
+    def route(self):
+        # Clients and load balancers may add a query string (/health?probe=1); route on the path alone.
+        return urlsplit(self.path).path
+
+    def do_GET(self):
+        path = self.route()
+        if path == "/health":
+            self.send_json(200, self.service.status())
+        elif path == "/roster":
+            self.send_json(200, {"session": self.service.session, "students": self.service.get_roster()})
+        elif path == "/metrics":
+            self.send_body(200, registry.prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        elif path == "/metrics.json":
+            self.send_json(200, registry.snapshot())
+        elif path == "/events":
+            self.stream_events()
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        path = self.route()
+        if path not in ("/frames", "/images"):
+            self.send_json(404, {"error": "Not found"})
+            return
+        try:
+            frame = decode_image(self.read_body())
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        try:
+            if path == "/frames":
+                result = self.service.process(frame)
+                self.send_json(200, {"detections": [{k: d[k] for k in ("box", "label", "track_id")} for d in result["detections"]]})
+            else:
+                self.send_json(200, {"faces": self.service.identify(frame)})
+        except Exception as e:
+            logging.error(f"Error processing {self.path}: {e}")
+            self.send_json(500, {"error": str(e)})
+
+    def stream_events(self):
+        events = self.service.events.subscribe()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while self.service.running:
+                try:
+                    event = events.get(timeout=15)
+                    self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n".encode("utf-8"))
+                except queue.Empty:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.service.events.unsubscribe(events)
+
+def serve(service, host="127.0.0.1", port=8765):
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,35 @@
+import time
+import threading
+from contextlib import contextmanager
+
+class StartupTimer:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def record(self, name, started):
+        ended = time.perf_counter()
+        with self.lock:
+            self.stages.append((name, started - self.origin, ended - started, threading.current_thread().name))
+
+    def mark(self, name):
+        self.record(name, time.perf_counter())
+
+    def report(self):
+        with self.lock:
+            stages = sorted(self.stages, key=lambda s: s[1])
+        lines = ["Startup timing (ms since launch / duration ms / thread):"]
+        for name, at, duration, thread in stages:
+            lines.append(f"  {at * 1000:8.1f}  {duration * 1000:8.1f}  {thread:<14}  {name}")
+        return "\n".join(lines)
+
+timer = StartupTimer()
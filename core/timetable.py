@@ -0,0 +1,137 @@
+import os
+import csv
+import bisect
+import logging
+import threading
+from datetime import datetime, timedelta
+from .constants import *
+from .utils import normalize
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+NON_LECTURE_WORDS = ("break", "homework")
+FACULTY_PREFIXES = ("prof.", "dr.", "mr.", "mrs.", "ms.")
+
+def parse_minutes(value):
+    t = datetime.strptime(value.strip(), "%H:%M")
+    return t.hour * 60 + t.minute
+
+def parse_range(range_str):
+    start, end = range_str.split("-")
+    return parse_minutes(start), parse_minutes(end)
+
+def looks_like_faculty(value):
+    return normalize(value).startswith(FACULTY_PREFIXES)
+
+def is_lecture(entry, start, end):
+    # Breaks, homework and rows without a faculty are in the sheet for display but are not lectures to attend;
+    # neither are ranges that end before they start (e.g. "12:30-1:15" written in 12-hour time).
+    subject, faculty = normalize(entry.get("Subject", "")), normalize(entry.get("Faculty", ""))
+    if subject in ("", "nan") or faculty in ("", "nan") or looks_like_faculty(subject):
+        return False
+    if any(word in subject for word in NON_LECTURE_WORDS):
+        return False
+    return end > start
+
+def read_timetable_rows(timetable_dir=TIMETABLE_DIR):
+    rows = []
+    for fname in sorted(os.listdir(timetable_dir)):
+        if not fname.endswith(".csv"):
+            continue
+        try:
+            with open(os.path.join(timetable_dir, fname), newline="", encoding="utf-8") as f:
+                rows.extend(csv.DictReader(f))
+        except Exception as e:
+            logging.error(f"Error loading timetable {fname}: {e}")
+    return rows
+
+class CompiledTimetable:
+    def __init__(self, rows):
+        self.slots = {}
+        malformed = 0
+        for order, row in enumerate(rows):
+            time_range = row.get("Time") or row.get("Period Time") or ""
+            try:
+                start, end = parse_range(time_range)
+            except Exception:
+                malformed += 1
+                continue
+            key = (normalize(row.get("Day", "")), normalize(row.get("Division", "")), normalize(row.get("Batch", "")))
+            subject, faculty = row.get("Subject", ""), row.get("Faculty", "")
+            # Some rows have Subject and Faculty swapped in the sheet.
+            if looks_like_faculty(subject) and not looks_like_faculty(faculty):
+                subject, faculty = faculty, subject
+            entry = {
+                "Day": row.get("Day", ""),
+                "Time": time_range,
+                "Division": row.get("Division", ""),
+                "Batch": row.get("Batch", ""),
+                "Subject": subject,
+                "Faculty": faculty
+            }
+            self.slots.setdefault(key, []).append((start, end, order, entry))
+        self.index = {}
+        for key, items in self.slots.items():
+            items.sort(key=lambda item: (item[0], item[2]))
+            longest = max(end - start for start, end, _, _ in items)
+            self.index[key] = ([item[0] for item in items], items, longest)
+        if malformed:
+            logging.error(f"Skipped {malformed} timetable rows with malformed times")
+
+    def __len__(self):
+        return sum(len(items) for items in self.slots.values())
+
+    def _find(self, key, minute):
+        if key not in self.index:
+            return None
+        starts, items, longest = self.index[key]
+        best = None
+        i = bisect.bisect_right(starts, minute) - 1
+        while i >= 0 and starts[i] >= minute - longest:
+            start, end, order, entry = items[i]
+            if end >= minute and (best is None or order < best[0]):
+                best = (order, entry)
+            i -= 1
+        return best
+
+    def lookup(self, day, division, batch, ts):
+        minute = ts.hour * 60 + ts.minute
+        day, division = normalize(day), normalize(division)
+        matches = [m for m in (self._find((day, division, normalize(batch)), minute), self._find((day, division, ""), minute)) if m]
+        return min(matches, key=lambda m: m[0])[1] if matches else {}
+
+    def weekly_subjects(self, division, batch):
+        division, batch = normalize(division), normalize(batch)
+        subjects = {}
+        for (day, div, bat), items in self.slots.items():
+            if div != division or bat not in (batch, "") or day not in WEEKDAYS:
+                continue
+            for start, end, _, entry in items:
+                if not is_lecture(entry, start, end):
+                    continue
+                subjects.setdefault(entry["Subject"], set()).add(WEEKDAYS.index(day))
+        return subjects
+
+    def lecture_totals(self, division, batch, start, end):
+        # Lectures are counted per scheduled day, matching how presence is counted once per subject per day.
+        weekly = self.weekly_subjects(division, batch)
+        day_counts = [0] * 7
+        day = start
+        while day <= end:
+            day_counts[day.weekday()] += 1
+            day += timedelta(days=1)
+        return {subject: sum(day_counts[d] for d in days) for subject, days in weekly.items()}
+
+_compiled = None
+_compiled_lock = threading.Lock()
+
+def reload_timetable():
+    global _compiled
+    compiled = CompiledTimetable(read_timetable_rows())
+    with _compiled_lock:
+        _compiled = compiled
+    return compiled
+
+def get_timetable():
+    with _compiled_lock:
+        compiled = _compiled
+    return compiled if compiled is not None else reload_timetable()
@@ -0,0 +1,79 @@
+import itertools
+import numpy as np
+
+UNKNOWN = "Unknown"
+
+def iou_matrix(boxes_a, boxes_b):
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    if not len(a) or not len(b):
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return inter / np.maximum(union, 1e-6)
+
+class Track:
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = box
+        self.label = UNKNOWN
+        self.confidence = 0.0
+        self.missed = 0
+        self.since_verified = 0
+        self.confirmed = False
+
+class IoUTracker:
+    def __init__(self, iou_threshold=0.3, max_missed=15, reverify_every=30, min_confidence=0.0):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.reverify_every = reverify_every
+        self.min_confidence = min_confidence
+        self.tracks = []
+        self._ids = itertools.count(1)
+
+    def update(self, boxes):
+        iou = iou_matrix([t.box for t in self.tracks], boxes)
+        assigned = [None] * len(boxes)
+        matched_tracks = set()
+        if iou.size:
+            candidates = np.argwhere(iou >= self.iou_threshold)
+            order = np.argsort(-iou[candidates[:, 0], candidates[:, 1]])
+            for ti, bi in candidates[order]:
+                if ti in matched_tracks or assigned[bi] is not None:
+                    continue
+                track = self.tracks[ti]
+                track.box = tuple(int(v) for v in boxes[bi])
+                track.missed = 0
+                track.since_verified += 1
+                assigned[bi] = track
+                matched_tracks.add(ti)
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+        for bi, track in enumerate(assigned):
+            if track is None:
+                track = Track(next(self._ids), tuple(int(v) for v in boxes[bi]))
+                self.tracks.append(track)
+                assigned[bi] = track
+        return assigned
+
+    def needs_verification(self, track):
+        return (
+            not track.confirmed
+            or track.since_verified >= self.reverify_every
+            or track.confidence < self.min_confidence
+        )
+
+    def verify(self, track, label, confidence):
+        track.since_verified = 0
+        track.confidence = float(confidence)
+        if label != track.label:
+            track.label = label
+            track.confirmed = False
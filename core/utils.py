@@ -1,8 +1,11 @@
 import os
 import csv
+import shutil
 import logging
 from datetime import datetime
 
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
 def normalize(val):
     return str(val).strip().replace(" ", "").lower()
 
@@ -51,4 +54,36 @@ def append_csv(filepath, row, headers=None):
                 writer.writeheader()
             writer.writerow(row)
     except Exception as e:
-        logging.error(f"Error appending to {filepath}: {e}")
\ No newline at end of file
+        logging.error(f"Error appending to {filepath}: {e}")
+
+def list_face_images(folder):
+    return sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if f.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+def replace_file(path, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def copy_tree(src, dest, progress=None, cancelled=None):
+    files = []
+    for dirpath, _, filenames in os.walk(src):
+        files.extend(os.path.join(dirpath, name) for name in filenames)
+    try:
+        for i, path in enumerate(files, 1):
+            if cancelled and cancelled():
+                shutil.rmtree(dest, ignore_errors=True)
+                return False
+            target = os.path.join(dest, os.path.relpath(path, src))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(path, target)
+            if progress:
+                progress(i, len(files))
+    except Exception:
+        shutil.rmtree(dest, ignore_errors=True)
+        raise
+    os.makedirs(dest, exist_ok=True)
+    return True
@@ -0,0 +1,122 @@
+import os
+import time
+import shutil
+import argparse
+import logging
+import cv2
+import numpy as np
+from core.constants import *
+from core.detection import detection_size
+from core.inference import load_detector, load_embedder, quantized_path
+from core.utils import list_face_images
+
+def export_yolo(size):
+    from ultralytics import YOLO
+    exported = YOLO(YOLO_MODEL_PATH).export(format="onnx", imgsz=size, dynamic=True, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(YOLO_ONNX_PATH):
+        shutil.move(exported, YOLO_ONNX_PATH)
+    return YOLO_ONNX_PATH
+
+def export_arcface():
+    import tensorflow as tf
+    import tf2onnx
+    from deepface import DeepFace
+    client = DeepFace.build_model("ArcFace")
+    model = getattr(client, "model", client)
+    spec = (tf.TensorSpec((None, *model.input_shape[1:]), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=13, output_path=ARCFACE_ONNX_PATH)
+    return ARCFACE_ONNX_PATH
+
+def quantize(path):
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(path, quantized_path(path), weight_type=QuantType.QInt8)
+    return quantized_path(path)
+
+def sample_images(limit):
+    paths = []
+    for label in sorted(os.listdir(FACE_DATASET_DIR)):
+        folder = os.path.join(FACE_DATASET_DIR, label)
+        if os.path.isdir(folder):
+            paths.extend(list_face_images(folder))
+    step = max(1, len(paths) // limit) if limit else 1
+    return paths[::step][:limit or None]
+
+def box_iou(a, b):
+    x1, y1 = np.maximum(a[0], b[0]), np.maximum(a[1], b[1])
+    x2, y2 = np.minimum(a[2], b[2]), np.minimum(a[3], b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def run_backend(detector, embedder, frames):
+    detect_ms, embed_ms, outputs = [], [], []
+    for frame in frames:
+        started = time.perf_counter()
+        boxes, landmarks = detector.detect(frame)
+        detect_ms.append((time.perf_counter() - started) * 1000)
+        crops = embedder.crop_faces(frame, boxes, landmarks)
+        started = time.perf_counter()
+        embeddings, valid = embedder.embed_batch(crops)
+        if len(crops):
+            embed_ms.append((time.perf_counter() - started) * 1000)
+        outputs.append((boxes, embeddings[valid]))
+    return detect_ms, embed_ms, outputs
+
+def agreement(reference, outputs):
+    # Face count matches, mean IoU of the best-matching box, and cosine similarity of the first face's embedding.
+    same, ious, cosines = 0, [], []
+    for (ref_boxes, ref_emb), (boxes, emb) in zip(reference, outputs):
+        same += len(ref_boxes) == len(boxes)
+        for box in ref_boxes:
+            ious.append(max((box_iou(box, b) for b in boxes), default=0.0))
+        if len(ref_emb) and len(emb):
+            a, b = ref_emb[0], emb[0]
+            cosines.append(float(a @ b / max(np.linalg.norm(a) * np.linalg.norm(b), 1e-12)))
+    mean = lambda v: float(np.mean(v)) if v else float("nan")
+    return same / max(len(reference), 1), mean(ious), mean(cosines)
+
+def compare(limit, size):
+    frames = [f for f in (cv2.imread(p) for p in sample_images(limit)) if f is not None]
+    if not frames:
+        print(f"No images found under {FACE_DATASET_DIR}")
+        return
+    candidates = [("native", "native", False), ("onnx fp32", "onnx", False)]
+    if os.path.exists(quantized_path(YOLO_ONNX_PATH)) or os.path.exists(quantized_path(ARCFACE_ONNX_PATH)):
+        candidates.append(("onnx int8", "onnx", True))
+    print(f"Comparing on {len(frames)} images at detection size {size}")
+    print(f"{'backend':<11} {'detect p50':>10} {'detect p95':>10} {'embed p50':>10} {'same count':>10} {'box IoU':>8} {'cosine':>7}")
+    reference = None
+    for name, backend, quantized in candidates:
+        detector = load_detector(size, backend, quantized)
+        embedder = load_embedder(backend, quantized)
+        # One untimed pass so graph setup is not counted against the first image.
+        run_backend(detector, embedder, frames[:1])
+        detect_ms, embed_ms, outputs = run_backend(detector, embedder, frames)
+        if reference is None:
+            reference = outputs
+        same, iou, cosine = agreement(reference, outputs)
+        pct = lambda v, q: float(np.percentile(v, q)) if v else float("nan")
+        print(f"{name:<11} {pct(detect_ms, 50):>8.1f}ms {pct(detect_ms, 95):>8.1f}ms {pct(embed_ms, 50):>8.1f}ms {same:>10.1%} {iou:>8.3f} {cosine:>7.4f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export YOLO and ArcFace to ONNX for the ONNX Runtime inference backend.")
+    parser.add_argument("--size", type=int, default=None, help="Detector input size to export (default: detection_size setting)")
+    parser.add_argument("--quantize", action="store_true", help="Also write INT8 dynamically quantized models (*.int8.onnx)")
+    parser.add_argument("--skip-export", action="store_true", help="Reuse existing .onnx files")
+    parser.add_argument("--compare", action="store_true", help="Compare latency and agreement of each backend on dataset images")
+    parser.add_argument("--limit", type=int, default=100, help="Number of dataset images used by --compare (default: 100)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    size = args.size or detection_size() or 640
+    if not args.skip_export:
+        logging.info(f"Exported {export_yolo(size)}")
+        logging.info(f"Exported {export_arcface()}")
+    if args.quantize:
+        for path in (YOLO_ONNX_PATH, ARCFACE_ONNX_PATH):
+            logging.info(f"Quantized {quantize(path)}")
+    if args.compare:
+        compare(args.limit, size)
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,14 @@ from tkinter import ttk, messagebox, simpledialog, filedialog
 import os
 import csv
 from core.admin_backend import AdminBackend
+from core.bulk_import import bulk_import_folders
+from core.attendance_stats import attendance_summary, defaulter_threshold, find_defaulters, overall_percentage, semester_start
+from core.constants import ATTENDANCE_HEADERS
+from core.paging import ListSource
 from gui.signup import SignUpDialog
+from gui.virtual_table import VirtualTable
+from gui.tasks import TaskRunner, TaskPanel, TaskStatusBar
 from gui.reports import ReportsFrame
-from core.constants import STUDENTS_CSV
 
 def normalize(val):
     return str(val).strip().replace(" ", "").lower()
@@ -16,6 +21,8 @@ class AdminDashboard(tk.Frame):
         self.master = master
         self.on_logout = on_logout
         self.current_page = self.show_dashboard
+        self.tasks = TaskRunner(self)
+        self.bind("<Destroy>", lambda e: e.widget is self and self.tasks.shutdown())
 
         sidebar = tk.Frame(self, bg="#181C1F", width=200)
         sidebar.pack(side=tk.LEFT, fill=tk.Y)
@@ -31,6 +38,7 @@ class AdminDashboard(tk.Frame):
             ("Logs & Audit", self.show_logs),
             ("Settings", self.show_settings),
             ("Notifications", self.show_notifications),
+            ("Tasks", self.show_tasks),
             ("Logout", self.logout)
         ]
         self.buttons = []
@@ -50,8 +58,11 @@ class AdminDashboard(tk.Frame):
         )
         refresh_btn.pack(fill=tk.X, padx=10, pady=2)
 
-        self.content = tk.Frame(self, bg="#1F2326")
-        self.content.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        main = tk.Frame(self, bg="#1F2326")
+        main.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        TaskStatusBar(main, self.tasks).pack(side=tk.BOTTOM, fill=tk.X)
+        self.content = tk.Frame(main, bg="#1F2326")
+        self.content.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         self.show_dashboard()
 
     def clear_content(self):
@@ -67,9 +78,9 @@ class AdminDashboard(tk.Frame):
             bg="#1F2326", fg="#00FF99"
         ).pack(pady=16)
         stats = [
-            ("Total Users", len(AdminBackend.get_users())),
-            ("Total Students", len(AdminBackend.get_students())),
-            ("Attendance Files", len(AdminBackend.get_attendance_files())),
+            ("Total Users", AdminBackend.count_users()),
+            ("Total Students", AdminBackend.count_students()),
+            ("Attendance Sessions", len(AdminBackend.get_attendance_files())),
             ("Face Folders (Students)", len(AdminBackend.get_face_folders())),
             ("Timetable Files", len(AdminBackend.get_timetable_files()))
         ]
@@ -79,6 +90,42 @@ class AdminDashboard(tk.Frame):
                 bg="#1F2326", fg="#FFF"
             ).pack(anchor="w", padx=50, pady=2)
 
+        status = tk.Label(
+            self.content, text="Calculating attendance percentages...",
+            font=("Segoe UI", 13), bg="#1F2326", fg="#AAA"
+        )
+        status.pack(anchor="w", padx=50, pady=(12, 2))
+
+        def work(task):
+            summary = attendance_summary()
+            threshold = defaulter_threshold()
+            return semester_start(), overall_percentage(summary), threshold, find_defaulters(summary, threshold)
+
+        def done(result):
+            # The page may have been left (or rebuilt) while the summary was computed.
+            if self.current_page != self.show_dashboard or not status.winfo_exists():
+                return
+            start, overall, threshold, defaulters = result
+            status.config(text=f"Overall Attendance (since {start}): {overall}%", font=("Segoe UI", 13, "bold"), fg="#00FF99")
+            tk.Label(
+                self.content, text=f"Defaulters (below {threshold:g}%): {len(defaulters)}",
+                font=("Segoe UI", 13), bg="#1F2326", fg="#FF6666"
+            ).pack(anchor="w", padx=50, pady=2)
+            columns = ("PRN", "Student Name", "Subject", "Attended", "Percentage")
+            table = ttk.Treeview(self.content, columns=columns, show="headings", height=10)
+            for col in columns:
+                table.heading(col, text=col)
+                table.column(col, width=150 if col in ("Student Name", "Subject") else 100)
+            for r in defaulters:
+                table.insert("", "end", values=(r["PRN"], r["Student Name"], r["Subject"], f"{r['Present']}/{r['Total']}", f"{r['Percentage']}%"))
+            table.pack(anchor="w", padx=50, pady=6)
+
+        def failed(e):
+            if status.winfo_exists():
+                status.config(text=f"Could not calculate attendance: {e}", fg="#FF6666")
+
+        self.tasks.submit("Calculate attendance percentages", work, on_done=done, on_error=failed)
+
     def show_user_mgmt(self):
         self.current_page = self.show_user_mgmt
         self.clear_content()
@@ -144,20 +191,11 @@ class AdminDashboard(tk.Frame):
         frm.pack(pady=4, fill=tk.BOTH, expand=True)
 
         columns = ("PRN", "Name", "Class", "Division", "Batch")
-        self.tree = ttk.Treeview(frm, columns=columns, show="headings")
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100)
+        self.tree = VirtualTable(frm, ListSource(AdminBackend.get_students), columns, height=15)
         self.tree.pack(fill=tk.BOTH, expand=True)
 
         def refresh_table():
-            for i in self.tree.get_children():
-                self.tree.delete(i)
-            students = AdminBackend.get_students()
-            for s in students:
-                self.tree.insert("", "end", values=(s["PRN"], s["Name"], s["Class"], s["Division"], s["Batch"]))
-
-        refresh_table()
+            self.tree.refresh()
 
         def add_student_popup():
             popup = tk.Toplevel(self)
@@ -198,20 +236,20 @@ class AdminDashboard(tk.Frame):
             tk.Button(popup, text="Add", command=add).pack(pady=8)
 
         def remove_student():
-            selected = self.tree.selection()
+            selected = self.tree.selected_rows()
             if not selected:
                 return
-            student_prn = self.tree.item(selected[0])["values"][0]
+            student_prn = selected[0]["PRN"]
             if messagebox.askyesno("Remove Student", "Are you sure you want to remove this student?"):
                 AdminBackend.remove_student(student_prn)
                 messagebox.showinfo("Remove Student", "Student removed.")
                 refresh_table()
 
         def edit_student_popup():
-            selected = self.tree.selection()
+            selected = self.tree.selected_rows()
             if not selected:
                 return
-            s = self.tree.item(selected[0])["values"]
+            s = [selected[0][col] for col in columns]
             popup = tk.Toplevel(self)
             popup.title("Edit Student")
             popup.geometry("340x340")
@@ -243,12 +281,9 @@ class AdminDashboard(tk.Frame):
                 sclass = ent_class.get().strip()
                 sdiv = ent_div.get().strip()
                 sbatch = ent_batch.get().strip()
-                students = AdminBackend.get_students()
-                students = [st for st in students if st["PRN"] != sprn]
-                students.append({
+                AdminBackend.update_student({
                     "PRN": sprn, "Name": sname, "Class": sclass, "Division": sdiv, "Batch": sbatch
                 })
-                AdminBackend.write_csv(STUDENTS_CSV, students, ["PRN", "Name", "Class", "Division", "Batch"])
                 messagebox.showinfo("Edit Student", "Student updated.", parent=popup)
                 popup.destroy()
                 refresh_table()
@@ -267,7 +302,7 @@ class AdminDashboard(tk.Frame):
                             return d[dk]
                 return ""
 
-            try:
+            def work(task):
                 with open(file_path, newline="", encoding="utf-8") as f:
                     reader = csv.DictReader(f)
                     imported_rows = []
@@ -281,18 +316,25 @@ class AdminDashboard(tk.Frame):
                         }
                         if imported_row["PRN"] and imported_row["Name"]:
                             imported_rows.append(imported_row)
+                        task.progress(len(imported_rows), message="Reading rows")
+                        if task.cancelled():
+                            return None
                 if not imported_rows:
+                    return None
+                return AdminBackend.import_students(imported_rows)
+
+            def done(added):
+                if added is None:
                     messagebox.showerror("Import Students CSV", "No valid rows found in selected CSV.")
                     return
-                students = AdminBackend.get_students()
-                existing_prns = set(s["PRN"] for s in students)
-                new_rows = [row for row in imported_rows if row["PRN"] not in existing_prns]
-                students.extend(new_rows)
-                AdminBackend.write_csv(STUDENTS_CSV, students, ["PRN", "Name", "Class", "Division", "Batch"])
-                messagebox.showinfo("Import Students CSV", f"Imported {len(new_rows)} new students.")
-                refresh_table()
-            except Exception as e:
-                messagebox.showerror("Import Students CSV", f"Failed to import: {e}")
+                messagebox.showinfo("Import Students CSV", f"Imported {added} new students.")
+                if self.current_page == self.show_students:
+                    refresh_table()
+
+            self.tasks.submit(
+                f"Import students from {os.path.basename(file_path)}", work, on_done=done,
+                on_error=lambda e: messagebox.showerror("Import Students CSV", f"Failed to import: {e}")
+            )
 
         btn_frame = tk.Frame(self.content, bg="#1F2326")
         btn_frame.pack(pady=6)
@@ -315,18 +357,13 @@ class AdminDashboard(tk.Frame):
             idx = file_list.curselection()
             if not idx:
                 return
-            data = AdminBackend.read_attendance(files[idx[0]])
             win = tk.Toplevel(self)
             win.title("Attendance Records")
-            if not data:
+            source = AdminBackend.attendance_source(files[idx[0]])
+            if not source.count():
                 tk.Label(win, text="No attendance data.").pack()
                 return
-            table = ttk.Treeview(win, columns=list(data[0].keys()), show="headings")
-            for k in data[0].keys():
-                table.heading(k, text=k)
-            for row in data:
-                table.insert("", "end", values=[row[k] for k in row])
-            table.pack(expand=True, fill=tk.BOTH)
+            VirtualTable(win, source, ATTENDANCE_HEADERS).pack(expand=True, fill=tk.BOTH)
 
         def export_file():
             idx = file_list.curselection()
@@ -335,8 +372,11 @@ class AdminDashboard(tk.Frame):
             file = files[idx[0]]
             dest = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
             if dest:
-                AdminBackend.export_attendance(file, dest)
-                messagebox.showinfo("Export", f"Exported to {dest}")
+                self.tasks.submit(
+                    f"Export {file}", lambda task: AdminBackend.export_attendance(file, dest),
+                    on_done=lambda _: messagebox.showinfo("Export", f"Exported to {dest}"),
+                    on_error=lambda e: messagebox.showerror("Export", f"Export failed: {e}")
+                )
 
         tk.Button(self.content, text="View Attendance", command=view_file).pack(pady=2)
         tk.Button(self.content, text="Export Attendance", command=export_file).pack(pady=2)
@@ -354,28 +394,37 @@ class AdminDashboard(tk.Frame):
         def add_folder():
             folder_path = filedialog.askdirectory(title="Select Student Face Folder")
             if folder_path:
-                ok, msg = AdminBackend.add_face_folder(folder_path)
-                if ok:
-                    messagebox.showinfo("Add Face Folder", msg)
-                else:
-                    messagebox.showerror("Add Face Folder", msg)
-                self.show_face_dataset()
+                def done(result):
+                    ok, msg = result
+                    if ok:
+                        messagebox.showinfo("Add Face Folder", msg)
+                    elif msg != "Cancelled.":
+                        messagebox.showerror("Add Face Folder", msg)
+                    if self.current_page == self.show_face_dataset:
+                        self.show_face_dataset()
+
+                self.tasks.submit(
+                    f"Add face folder {os.path.basename(folder_path)}",
+                    lambda task: AdminBackend.add_face_folder(folder_path, progress=task.progress, cancelled=task.cancelled),
+                    on_done=done, on_error=lambda e: messagebox.showerror("Add Face Folder", f"Failed to add folder: {e}")
+                )
 
         def add_folders_batch():
             parent_folder = filedialog.askdirectory(title="Select Parent Folder Containing Student Folders")
             if not parent_folder:
                 return
             subfolders = [os.path.join(parent_folder, name) for name in os.listdir(parent_folder) if os.path.isdir(os.path.join(parent_folder, name))]
-            added = 0
-            skipped = 0
-            for sub in subfolders:
-                ok, msg = AdminBackend.add_face_folder(sub)
-                if ok:
-                    added += 1
-                else:
-                    skipped += 1
-            messagebox.showinfo("Batch Add", f"Added {added} folders, skipped {skipped} (already existed).")
-            self.show_face_dataset()
+
+            def done(summary):
+                messagebox.showinfo("Batch Add", f"Added {summary['added']} folders, skipped {summary['skipped']} (already existed). Embedded {summary['embedded']} of {summary['images']} images.")
+                if self.current_page == self.show_face_dataset:
+                    self.show_face_dataset()
+
+            self.tasks.submit(
+                f"Batch add {len(subfolders)} face folders",
+                lambda task: bulk_import_folders(subfolders, progress=task.progress, cancelled=task.cancelled),
+                on_done=done, on_error=lambda e: messagebox.showerror("Batch Add", f"Batch import failed: {e}")
+            )
 
         def remove_folder():
             idx = folder_list.curselection()
@@ -446,19 +495,23 @@ class AdminDashboard(tk.Frame):
     def show_reports(self):
         self.current_page = self.show_reports
         self.clear_content()
-        ReportsFrame(self.content).pack(fill="both", expand=True)
+        ReportsFrame(self.content, self.tasks).pack(fill="both", expand=True)
+
+    def show_tasks(self):
+        self.current_page = self.show_tasks
+        self.clear_content()
+        tk.Label(self.content, text="Background Tasks", font=("Segoe UI", 16, "bold"), bg="#1F2326", fg="#00FF99").pack(pady=8)
+        TaskPanel(self.content, self.tasks).pack(fill=tk.BOTH, expand=True)
 
     def show_logs(self):
         self.current_page = self.show_logs
         self.clear_content()
         tk.Label(self.content, text="Logs & Audit", font=("Segoe UI", 16, "bold"), bg="#1F2326", fg="#00FF99").pack(pady=8)
-        logs = AdminBackend.get_logs()
-        table = ttk.Treeview(self.content, columns=["Timestamp", "Action", "Detail"], show="headings")
-        for c in ["Timestamp", "Action", "Detail"]:
-            table.heading(c, text=c)
-        for row in logs[-100:]:
-            table.insert("", "end", values=(row["Timestamp"], row["Action"], row["Detail"]))
-        table.pack(expand=True, fill=tk.BOTH)
+        table = VirtualTable(
+            self.content, AdminBackend.logs_source(), ["Timestamp", "Action", "Detail"],
+            sort="Timestamp", descending=True, widths={"Timestamp": 160, "Action": 180, "Detail": 400}
+        )
+        table.pack(expand=True, fill=tk.BOTH, padx=8)
 
     def show_settings(self):
         self.current_page = self.show_settings
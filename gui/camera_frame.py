@@ -1,178 +1,121 @@
 import tkinter as tk
+from tkinter import ttk
 from PIL import Image, ImageTk
 import cv2
-import joblib
-import csv
-import pandas as pd
-from datetime import datetime, timedelta
-from core.constants import *
-from core.attendance_logging import log_attendance
-from core.utils import normalize, time_in_range
+import time
+from datetime import timedelta
+from core.recognition import annotate
+from core.cameras import CameraManager, ModelLoader, camera_sources
+from core.startup import timer
+from core.metrics import registry, overlay_enabled
 import logging
-from ultralytics import YOLO
-from deepface import DeepFace
+
+def draw_overlay(frame, lines):
+    height = 8 + 16 * len(lines)
+    frame[:height] = (frame[:height] * 0.4).astype(frame.dtype)
+    for i, line in enumerate(lines):
+        cv2.putText(frame, line, (6, 18 + 16 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.42, (0, 255, 153), 1, cv2.LINE_AA)
+    return frame
 
 class CameraFrame(tk.Frame):
-    def __init__(self, master, width=480, height=320):
+    def __init__(self, master, width=480, height=320, sources=None, on_ready=None):
         super().__init__(master, bg="#181C1F")
         self.width = width
         self.height = height
-        self.csv_folder = ATTENDANCE_DIR
-        self.session_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.csv_file = os.path.join(self.csv_folder, f"final_attendance_report_{self.session_time}.csv")
-        self.face_confirm_count = 5
-        self.time_window = timedelta(minutes=2)
-        self.threshold = 0.2
-
-        if not os.path.exists(YOLO_MODEL_PATH):
-            raise FileNotFoundError("YOLO model file missing")
-        if not os.path.exists(SVM_MODEL_PATH):
-            raise FileNotFoundError("SVM model file missing")
-
-        self.yolo_model = YOLO(YOLO_MODEL_PATH)
-        self.clf = joblib.load(SVM_MODEL_PATH)
-        self.student_info = {}
-        self.students = {}
-        try:
-            if os.path.exists(STUDENTS_CSV):
-                df_students = pd.read_csv(STUDENTS_CSV, dtype=str).fillna("")
-                for _, row in df_students.iterrows():
-                    prn = str(row["PRN"]).strip()
-                    self.students[normalize(prn)] = row
-                    self.students[normalize(row.get("Name", ""))] = row
-                    self.student_info[normalize(prn)] = {
-                        "Sr No.": "",
-                        "PRN": prn,
-                        "Student Name": row.get("Name", ""),
-                        "Class": row.get("Class", ""),
-                        "Division": row.get("Division", ""),
-                        "Batch": row.get("Batch", ""),
-                        "Label": prn
-                    }
-        except Exception as e:
-            logging.error(f"Error loading students.csv: {e}")
-
-        self.timetable = []
-        try:
-            if os.path.exists(TIMETABLE_CSV):
-                df_tt = pd.read_csv(TIMETABLE_CSV, dtype=str).fillna("")
-                for _, row in df_tt.iterrows():
-                    self.timetable.append({
-                        "Day": normalize(row.get("Day", "")),
-                        "Time": row.get("Time", ""),
-                        "Division": normalize(row.get("Division", "")),
-                        "Batch": normalize(row.get("Batch", "")),
-                        "Subject": row.get("Subject", ""),
-                        "Faculty": row.get("Faculty", "")
-                    })
-        except Exception as e:
-            logging.error(f"Error loading timetable.csv: {e}")
-
-        try:
-            with open(self.csv_file, "w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Sr No.", "PRN", "Student Name", "Class", "Division", "Time", "Date", "Day", "Subject", "Faculty"])
-        except Exception as e:
-            logging.error(f"Error creating attendance CSV: {e}")
+        self.sources = sources or camera_sources()
+        self.on_ready = on_ready
+        self.manager = None
+        self.cameras = []
+        self.selected = None
 
-        self.recognition_counter = {}
-        self.last_logged_times = {}
-        self.row_counter = 1
-        self.cap = cv2.VideoCapture(0)
-        self.label = tk.Label(self, bg="#181C1F")
+        self.header = tk.Frame(self, bg="#181C1F")
+        self.header.pack()
+        self.label = tk.Label(self, bg="#181C1F", fg="#AAA", font=("Segoe UI", 13), text="Loading face models...", width=width // 10, height=height // 22)
         self.label.pack()
         self.names_label = tk.Label(self, bg="#181C1F", fg="#00FF99", font=("Segoe UI", 13))
         self.names_label.pack()
         self.running = True
         self.imgtk = None
-        self.after(0, self.update_frame)
-
-    def match_timetable_for_student(self, student, ts):
-        if not student or not self.timetable:
-            return {}
-        day = normalize(ts.strftime("%A"))
-        time_now = ts.strftime("%H:%M")
-        student_div = normalize(student.get("Division", ""))
-        student_batch = normalize(student.get("Batch", ""))
-        for row in self.timetable:
-            row_day = normalize(row.get("Day", ""))
-            row_div = normalize(row.get("Division", ""))
-            row_batch = normalize(row.get("Batch", ""))
-            if row_day != day or row_div != student_div or (row_batch and row_batch != student_batch):
-                continue
-            if time_in_range(time_now, row["Time"]):
-                return row
-        return {}
+        self.last_results = {}
+        # F2 toggles the FPS / per-stage latency overlay; performance_overlay in Settings turns it on at start.
+        self.show_metrics = overlay_enabled()
+        self.overlay_lines = []
+        self.overlay_updated = 0.0
+        self.winfo_toplevel().bind("<F2>", self.toggle_overlay, add="+")
+        # Models load and warm up off the Tk thread so the login window paints straight away.
+        self.loader = ModelLoader()
+        self.loader.start()
+        self.after(100, self.wait_for_models)
 
-    def update_frame(self):
+    def wait_for_models(self):
         if not self.running:
             return
-        ret, frame = self.cap.read()
-        recognized_names = []
-        if ret:
-            try:
-                results = self.yolo_model(frame)[0]
-                boxes = results.boxes.xyxy.cpu().numpy().astype(int) if results.boxes.xyxy.numel() else []
-                for (x1, y1, x2, y2) in boxes:
-                    face_img = frame[y1:y2, x1:x2]
-                    label = "Unknown"
-                    color = (0, 0, 255)
-                    try:
-                        embedding = DeepFace.represent(img_path=face_img, model_name="ArcFace", enforce_detection=False)[0]["embedding"]
-                        prediction = self.clf.predict([embedding])[0]
-                        prob = self.clf.predict_proba([embedding])[0].max()
-                        if prob >= self.threshold:
-                            label = str(prediction).strip()
-                            color = (0, 255, 0)
-                            key = normalize(label)
-                            self.recognition_counter[key] = self.recognition_counter.get(key, 0) + 1
-                            if self.recognition_counter[key] == self.face_confirm_count:
-                                now = datetime.now()
-                                last_time = self.last_logged_times.get(key)
-                                if not last_time or now - last_time > self.time_window:
-                                    student = self.student_info.get(key, None)
-                                    time_str = now.strftime("%H:%M")
-                                    date_str = now.strftime("%Y-%m-%d")
-                                    day_str = now.strftime("%A")
-                                    timetable_row = self.match_timetable_for_student(student, now)
-                                    subject = timetable_row.get("Subject", "") if timetable_row else ""
-                                    faculty = timetable_row.get("Faculty", "") if timetable_row else ""
-                                    if student:
-                                        row = [
-                                            self.row_counter, student["PRN"], student["Student Name"],
-                                            student["Class"], student["Division"], time_str, date_str,
-                                            day_str, subject, faculty
-                                        ]
-                                        self.row_counter += 1
-                                        log_attendance(self.csv_file, student["PRN"], student["Student Name"], self.students, self.timetable)
-                                    self.last_logged_times[key] = now
-                        else:
-                            label = "Unknown"
-                            color = (0, 0, 255)
-                    except Exception as e:
-                        logging.error(f"Face recognition error: {e}")
-                        label = "Unknown"
-                        color = (0, 0, 255)
+        if not self.loader.done:
+            self.after(100, self.wait_for_models)
+            return
+        if self.loader.error is not None:
+            self.label.config(text=f"Face models failed to load:\n{self.loader.error}", fg="#FF6666")
+            return
+        with timer.stage("start cameras"):
+            self.manager = CameraManager(self.sources, models=self.loader.models, face_confirm_count=5, time_window=timedelta(minutes=2))
+            self.cameras = self.manager.cameras
+            self.selected = self.cameras[0]
+            if len(self.cameras) > 1:
+                self.camera_choice = ttk.Combobox(self.header, state="readonly", values=[f"{c.name}: {c.source}" for c in self.cameras])
+                self.camera_choice.current(0)
+                self.camera_choice.bind("<<ComboboxSelected>>", self.select_camera)
+                self.camera_choice.pack(pady=(0, 4))
+            self.label.config(text="", width=0, height=0)
+            self.manager.start()
+        if self.on_ready:
+            self.on_ready()
+        self.render()
+
+    def toggle_overlay(self, event=None):
+        self.show_metrics = not self.show_metrics
 
-                    recognized_names.append(label)
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                    cv2.putText(frame, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+    def select_camera(self, event=None):
+        self.selected = self.cameras[self.camera_choice.current()]
 
-                frame = cv2.resize(frame, (self.width, self.height))
+    def render(self):
+        if not self.running:
+            return
+        started = time.perf_counter()
+        try:
+            for camera in self.cameras:
+                result = camera.result_queue.get_latest()
+                if result is not None:
+                    self.last_results[camera.name] = result
+            last_result = self.last_results.get(self.selected.name)
+            if last_result is not None:
+                names = last_result["names"]
+                if names:
+                    self.names_label.config(text="Recognized: " + ", ".join(set(names)))
+                else:
+                    self.names_label.config(text="No recognized faces.")
+            frame = self.selected.preview_queue.get_latest()
+            if frame is not None:
+                h, w = frame.shape[:2]
+                # Scale down first and draw the (source-coordinate) boxes onto the small copy.
+                frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+                if last_result:
+                    frame = annotate(frame, last_result["detections"], scale=(self.width / w, self.height / h))
+                if self.show_metrics:
+                    if started - self.overlay_updated > 0.5:
+                        self.overlay_lines = registry.overlay_lines()
+                        self.overlay_updated = started
+                    frame = draw_overlay(frame, self.overlay_lines)
                 cv2image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                 img = Image.fromarray(cv2image)
                 self.imgtk = ImageTk.PhotoImage(image=img)
                 self.label.configure(image=self.imgtk)
-
-                if recognized_names:
-                    self.names_label.config(text="Recognized: " + ", ".join(set(recognized_names)))
-                else:
-                    self.names_label.config(text="No recognized faces.")
-            except Exception as e:
-                logging.error(f"Error in update_frame: {e}")
-        self.after(30, self.update_frame)
+                registry.observe("paint", time.perf_counter() - started)
+                registry.count("frames_painted")
+        except Exception as e:
+            logging.error(f"Error in render: {e}")
+        self.after(30, self.render)
 
     def stop(self):
         self.running = False
-        if self.cap.isOpened():
-            self.cap.release()
\ No newline at end of file
+        if self.manager:
+            self.manager.stop()
@@ -43,12 +43,11 @@ class LoginScreen(tk.Frame):
             messagebox.showwarning("Login", "Please fill all fields and select a role.")
             return
         # Validate login
-        users = AdminBackend.get_users()
-        for user in users:
-            if user["username"] == username and user["role"] == role:
-                if bcrypt.checkpw(password.encode('utf-8'), user["password"].encode('utf-8')):
-                    self.on_login(role, username)
-                    return
+        user = AdminBackend.get_user(username)
+        if user and user["role"] == role:
+            if bcrypt.checkpw(password.encode('utf-8'), user["password"].encode('utf-8')):
+                self.on_login(role, username)
+                return
         messagebox.showerror("Login", "Invalid username, password, or role.")
 
     def open_signup(self):
@@ -1,15 +1,16 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
-import csv
 import os
 from datetime import datetime
 import smtplib
 from email.message import EmailMessage
-from core.constants import ATTENDANCE_DIR
+from core.reports import export_report
+from core.attendance_stats import export_summary
 
 class ReportsFrame(tk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, tasks):
         super().__init__(parent, bg="#1F2326")
+        self.tasks = tasks
         tk.Label(self, text="Attendance Full Report (by Subject & Date Range)", font=("Segoe UI", 16, "bold"), bg="#1F2326", fg="#00FF99").pack(pady=10)
         tk.Label(self, text="You can select which attendance log (live streaming) to report on.", bg="#1F2326", fg="#AAA").pack(pady=4)
 
@@ -32,8 +33,19 @@ class ReportsFrame(tk.Frame):
 
         button_row = tk.Frame(self, bg="#1F2326")
         button_row.pack(pady=12)
-        tk.Button(button_row, text="Generate & Export Full Report", command=self.export_report, bg="#00CC99", fg="#FFF").pack(side=tk.LEFT, padx=5)
-        tk.Button(button_row, text="Create & Email Report", command=self.create_and_email_report, bg="#4444FF", fg="#FFF").pack(side=tk.LEFT, padx=5)
+        self.export_buttons = [
+            tk.Button(button_row, text="Generate & Export Full Report", command=self.export_report, bg="#00CC99", fg="#FFF"),
+            tk.Button(button_row, text="Create & Email Report", command=self.create_and_email_report, bg="#4444FF", fg="#FFF"),
+            tk.Button(button_row, text="Export Attendance Percentages", command=self.export_percentages, bg="#CC8800", fg="#FFF"),
+        ]
+        for button in self.export_buttons:
+            button.pack(side=tk.LEFT, padx=5)
+
+    def set_exporting(self, exporting):
+        if not self.winfo_exists():
+            return
+        for button in self.export_buttons:
+            button.config(state=tk.DISABLED if exporting else tk.NORMAL)
 
     def export_report(self, send_after_export=False):
         subject = self.subject_entry.get().strip()
@@ -47,51 +59,79 @@ class ReportsFrame(tk.Frame):
             messagebox.showerror("Date format error", "Dates must be in YYYY-MM-DD format.")
             return
 
-        all_files = [os.path.join(ATTENDANCE_DIR, f) for f in os.listdir(ATTENDANCE_DIR) if f.endswith(".csv")]
-        merged_rows = []
-        header = None
-        for file_path in all_files:
-            with open(file_path, newline='', encoding="utf-8") as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-                if not header and rows:
-                    header = rows[0]
-                for row in rows[1:]:
-                    try:
-                        row_date = row[6]
-                        row_subject = row[8]
-                        row_dt = datetime.strptime(row_date, "%Y-%m-%d")
-                        if subject and subject.lower() not in row_subject.lower():
-                            continue
-                        if from_dt and row_dt < from_dt:
-                            continue
-                        if to_dt and row_dt > to_dt:
-                            continue
-                        merged_rows.append(row)
-                    except Exception:
-                        continue
-
-        if not merged_rows:
-            messagebox.showinfo("No data", "No records matched your criteria.")
-            return
-
         save_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")], title="Save Full Report")
         if not save_path:
             return
 
-        try:
-            with open(save_path, "w", newline='', encoding="utf-8") as out:
-                writer = csv.writer(out)
-                writer.writerow(header)
-                writer.writerows(merged_rows)
-            messagebox.showinfo("Exported", f"Report exported to {save_path}")
+        def done(count):
+            self.set_exporting(False)
+            if count is None:
+                cancelled()
+                return
+            if count == 0:
+                messagebox.showinfo("No data", "No records matched your criteria.")
+                return
+            messagebox.showinfo("Exported", f"Report exported to {save_path} ({count} rows)")
             self.exported_path = save_path
             if send_after_export:
                 self.send_email(auto_send=True)
-        except Exception as e:
+
+        def failed(e):
+            self.set_exporting(False)
             messagebox.showerror("Error", f"Could not save file: {e}")
             self.exported_path = None
 
+        def cancelled():
+            self.set_exporting(False)
+            self.exported_path = None
+            messagebox.showinfo("Export cancelled", "The report export was cancelled; no file was written.")
+
+        self.set_exporting(True)
+
+        self.tasks.submit(
+            f"Export report to {os.path.basename(save_path)}",
+            lambda task: export_report(
+                save_path, subject or None,
+                from_dt.strftime("%Y-%m-%d") if from_dt else None,
+                to_dt.strftime("%Y-%m-%d") if to_dt else None,
+                progress=lambda n: task.progress(n, message="Rows written"), cancelled=task.cancelled
+            ),
+            on_done=done, on_error=failed, on_cancel=cancelled
+        )
+
+    def export_percentages(self):
+        try:
+            from_date = self.from_date_entry.get().strip() or None
+            to_date = self.to_date_entry.get().strip() or None
+            for value in (from_date, to_date):
+                if value:
+                    datetime.strptime(value, "%Y-%m-%d")
+        except Exception:
+            messagebox.showerror("Date format error", "Dates must be in YYYY-MM-DD format.")
+            return
+        subject = self.subject_entry.get().strip()
+        save_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")], title="Save Attendance Percentages")
+        if not save_path:
+            return
+
+        def done(count):
+            self.set_exporting(False)
+            if not count:
+                messagebox.showinfo("No data", "No timetabled lectures matched your criteria.")
+                return
+            messagebox.showinfo("Exported", f"Attendance percentages exported to {save_path}")
+
+        def failed(e):
+            self.set_exporting(False)
+            messagebox.showerror("Error", f"Could not save file: {e}")
+
+        self.set_exporting(True)
+        self.tasks.submit(
+            f"Export attendance percentages to {os.path.basename(save_path)}",
+            lambda task: export_summary(save_path, subject, from_date, to_date),
+            on_done=done, on_error=failed, on_cancel=lambda: self.set_exporting(False)
+        )
+
     def create_and_email_report(self):
         self.export_report(send_after_export=True)
 
@@ -117,7 +157,7 @@ class ReportsFrame(tk.Frame):
                 messagebox.showerror("Missing Info", "All fields are required.")
                 return
 
-        try:
+        def send(task):
             msg = EmailMessage()
             msg["Subject"] = subject
             msg["From"] = sender_email
@@ -129,11 +169,14 @@ class ReportsFrame(tk.Frame):
                 file_name = os.path.basename(self.exported_path)
             msg.add_attachment(file_data, maintype="application", subtype="octet-stream", filename=file_name)
 
-            server = smtplib.SMTP("smtp.gmail.com", 587)
+            server = smtplib.SMTP("smtp.gmail.com", 587, timeout=30)
             server.starttls()
             server.login(sender_email, sender_password)
             server.send_message(msg)
             server.quit()
-            messagebox.showinfo("Email sent", f"Report sent to {recipient} successfully.")
-        except Exception as e:
-            messagebox.showerror("Email Error", f"Failed to send email: {e}")
+
+        self.tasks.submit(
+            f"Email report to {recipient}", send,
+            on_done=lambda _: messagebox.showinfo("Email sent", f"Report sent to {recipient} successfully."),
+            on_error=lambda e: messagebox.showerror("Email Error", f"Failed to send email: {e}")
+        )
@@ -58,8 +58,7 @@ class SignUpDialog(tk.Toplevel):
         if password != conf_password:
             messagebox.showerror("Sign Up", "Passwords do not match.")
             return
-        users = AdminBackend.get_users()
-        if any(u["username"] == username for u in users):
+        if AdminBackend.get_user(username):
             messagebox.showerror("Sign Up", "Username already exists.")
             return
         AdminBackend.add_user(username, password, role)
@@ -0,0 +1,188 @@
+import tkinter as tk
+from tkinter import ttk
+import itertools
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+class Task:
+    _ids = itertools.count(1)
+
+    def __init__(self, name):
+        self.id = next(self._ids)
+        self.name = name
+        self.status = QUEUED
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    # Called from the worker thread; matches the progress(done, total) callbacks used in core.
+    def progress(self, done, total=None, message=None):
+        self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self.status = CANCELLED
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def percent(self):
+        return int(100 * self.done / self.total) if self.total else 0
+
+class TaskRunner:
+    # Work runs on a thread pool; completion callbacks and listeners are marshalled back to Tk via after().
+    def __init__(self, widget, workers=4, poll_ms=100):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard-task")
+        self.tasks = []
+        self.listeners = []
+        self._callbacks = {}
+        self._completed = []
+        self._lock = threading.Lock()
+        self._job = None
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None, on_cancel=None, **kwargs):
+        task = Task(name)
+        self.tasks.append(task)
+        self._callbacks[task.id] = (on_done, on_error, on_cancel)
+        task.future = self.pool.submit(self._run, task, fn, args, kwargs)
+        self._schedule()
+        return task
+
+    def _run(self, task, fn, args, kwargs):
+        task.status = RUNNING
+        try:
+            task.result = fn(task, *args, **kwargs)
+            task.status = CANCELLED if task.cancelled() else DONE
+        except Exception as e:
+            logging.error(f"Task '{task.name}' failed: {e}")
+            task.error = e
+            task.status = FAILED
+        with self._lock:
+            self._completed.append(task)
+
+    def active(self):
+        return [t for t in self.tasks if not t.finished]
+
+    def clear_finished(self):
+        self.tasks = [t for t in self.tasks if not t.finished]
+        self._notify()
+
+    def _schedule(self):
+        if self._job is None:
+            try:
+                self._job = self.widget.after(self.poll_ms, self._poll)
+            except Exception:
+                self._job = None
+
+    def _poll(self):
+        self._job = None
+        with self._lock:
+            completed, self._completed = self._completed, []
+        # Tasks cancelled before they started never reach _run, so they are picked up from the task list.
+        completed += [t for t in self.tasks if t.status == CANCELLED and t.id in self._callbacks and t not in completed]
+        for task in completed:
+            on_done, on_error, on_cancel = self._callbacks.pop(task.id, (None, None, None))
+            try:
+                if task.status == DONE and on_done:
+                    on_done(task.result)
+                elif task.status == FAILED and on_error:
+                    on_error(task.error)
+                elif task.status == CANCELLED and on_cancel:
+                    on_cancel()
+            except Exception as e:
+                logging.error(f"Task callback for '{task.name}' failed: {e}")
+        self._notify()
+        if self.active() or self._completed:
+            self._schedule()
+
+    def _notify(self):
+        for listener in list(self.listeners):
+            try:
+                listener(self.tasks)
+            except Exception as e:
+                logging.error(f"Task listener failed: {e}")
+
+    def shutdown(self):
+        for task in self.active():
+            task.cancel()
+        self.pool.shutdown(wait=False)
+
+class TaskStatusBar(tk.Frame):
+    def __init__(self, master, runner, bg="#181C1F"):
+        super().__init__(master, bg=bg)
+        self.runner = runner
+        self.label = tk.Label(self, text="", bg=bg, fg="#AAA", anchor="w")
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=8)
+        self.bar = ttk.Progressbar(self, length=220, mode="determinate")
+        self.bar.pack(side=tk.RIGHT, padx=8, pady=4)
+        runner.listeners.append(self.update_tasks)
+        self.bind("<Destroy>", lambda e: e.widget is self and runner.listeners.remove(self.update_tasks))
+        self.update_tasks(runner.tasks)
+
+    def update_tasks(self, tasks):
+        active = [t for t in tasks if not t.finished]
+        if not active:
+            self.label.config(text="No background tasks running")
+            self.bar.config(mode="determinate", value=0)
+            return
+        task = active[0]
+        more = f" (+{len(active) - 1} more)" if len(active) > 1 else ""
+        detail = f"{task.message} " if task.message else ""
+        counts = f"{task.done}/{task.total}" if task.total else (str(task.done) if task.done else "")
+        self.label.config(text=f"{task.name}: {detail}{counts}{more}")
+        self.bar.config(maximum=max(task.total, 1), value=task.done if task.total else 0)
+
+class TaskPanel(tk.Frame):
+    def __init__(self, master, runner, bg="#1F2326"):
+        super().__init__(master, bg=bg)
+        self.runner = runner
+        columns = ("ID", "Task", "Status", "Progress", "Message")
+        self.table = ttk.Treeview(self, columns=columns, show="headings", height=14)
+        for col, width in zip(columns, (50, 260, 90, 110, 260)):
+            self.table.heading(col, text=col)
+            self.table.column(col, width=width)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
+        buttons = tk.Frame(self, bg=bg)
+        buttons.pack(pady=6)
+        tk.Button(buttons, text="Cancel Selected", command=self.cancel_selected, bg="#FF4444", fg="#FFF", font=("Segoe UI", 11)).pack(side=tk.LEFT, padx=3)
+        tk.Button(buttons, text="Clear Finished", command=runner.clear_finished, bg="#888888", fg="#FFF", font=("Segoe UI", 11)).pack(side=tk.LEFT, padx=3)
+        runner.listeners.append(self.update_tasks)
+        self.bind("<Destroy>", lambda e: e.widget is self and runner.listeners.remove(self.update_tasks))
+        self.update_tasks(runner.tasks)
+
+    def update_tasks(self, tasks):
+        selected = set(self.table.selection())
+        self.table.delete(*self.table.get_children())
+        for task in reversed(tasks):
+            progress = f"{task.done}/{task.total} ({task.percent}%)" if task.total else ""
+            message = str(task.error) if task.error else task.message
+            iid = str(task.id)
+            self.table.insert("", "end", iid=iid, values=(task.id, task.name, task.status, progress, message))
+            if iid in selected:
+                self.table.selection_add(iid)
+
+    def cancel_selected(self):
+        for iid in self.table.selection():
+            for task in self.runner.tasks:
+                if str(task.id) == iid and not task.finished:
+                    task.cancel()
+        self.update_tasks(self.runner.tasks)
@@ -0,0 +1,141 @@
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+class VirtualTable(tk.Frame):
+    # The Treeview only ever holds the visible window; rows are fetched from the source a page at a time.
+    def __init__(self, master, source, columns, page_size=200, sort=None, descending=False, widths=None, bg="#1F2326", height=20):
+        super().__init__(master, bg=bg)
+        self.source = source
+        self.columns = list(columns)
+        self.page_size = page_size
+        self.sort = sort
+        self.descending = descending
+        self.filter_text = ""
+        self.offset = 0
+        self.total = 0
+        self.visible = height
+        self.pages = OrderedDict()
+        self.rows = {}
+        self._filter_job = None
+
+        top = tk.Frame(self, bg=bg)
+        top.pack(fill=tk.X, pady=(0, 4))
+        tk.Label(top, text="Filter:", bg=bg, fg="#FFF").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self._schedule_filter())
+        tk.Entry(top, textvariable=self.filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
+        self.status = tk.Label(top, text="", bg=bg, fg="#AAA")
+        self.status.pack(side=tk.RIGHT)
+
+        body = tk.Frame(self, bg=bg)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(body, columns=self.columns, show="headings", height=height)
+        for col in self.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=(widths or {}).get(col, 100))
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units", 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units", 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units", 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-1, "pages"))
+        self.tree.bind("<Next>", lambda e: self.scroll(1, "pages"))
+        self.refresh()
+
+    def refresh(self):
+        self.source.refresh()
+        self.pages.clear()
+        self.total = self.source.count(self.filter_text)
+        self.offset = min(self.offset, max(0, self.total - self.visible))
+        self.render()
+
+    def selected_rows(self):
+        return [self.rows[iid] for iid in self.tree.selection() if iid in self.rows]
+
+    def sort_by(self, column):
+        if self.sort == column:
+            self.descending = not self.descending
+        else:
+            self.sort, self.descending = column, False
+        for col in self.columns:
+            arrow = (" ▼" if self.descending else " ▲") if col == self.sort else ""
+            self.tree.heading(col, text=col + arrow)
+        self.pages.clear()
+        self.offset = 0
+        self.render()
+
+    def _schedule_filter(self):
+        if self._filter_job:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(300, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        self.filter_text = self.filter_var.get().strip()
+        self.offset = 0
+        self.refresh()
+
+    def _page(self, index):
+        if index in self.pages:
+            self.pages.move_to_end(index)
+            return self.pages[index]
+        rows = self.source.fetch(index * self.page_size, self.page_size, self.sort, self.descending, self.filter_text)
+        self.pages[index] = rows
+        while len(self.pages) > 3:
+            self.pages.popitem(last=False)
+        return rows
+
+    def _window(self):
+        rows = []
+        start, end = self.offset, min(self.offset + self.visible, self.total)
+        for index in range(start // self.page_size, (max(end, 1) - 1) // self.page_size + 1):
+            page = self._page(index)
+            base = index * self.page_size
+            rows.extend(page[max(0, start - base):max(0, end - base)])
+        return rows
+
+    def render(self):
+        selected = {tuple(r.get(c, "") for c in self.columns) for r in self.selected_rows()}
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
+        for row in self._window():
+            values = tuple(row.get(c, "") for c in self.columns)
+            iid = self.tree.insert("", "end", values=values)
+            self.rows[iid] = row
+            if values in selected:
+                self.tree.selection_add(iid)
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + self.visible) / self.total))
+            self.status.config(text=f"{self.offset + 1}-{min(self.offset + self.visible, self.total)} of {self.total}")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status.config(text="No rows")
+
+    def scroll(self, amount, what="units", step=1):
+        delta = amount * (self.visible if what == "pages" else step)
+        self._move_to(self.offset + delta)
+        return "break"
+
+    def _move_to(self, offset):
+        offset = max(0, min(int(offset), max(0, self.total - self.visible)))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._move_to(float(value) * self.total)
+        elif action == "scroll":
+            self.scroll(int(value), unit)
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - rowheight - 4) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = min(self.offset, max(0, self.total - self.visible))
+            self.render()
@@ -1,18 +1,42 @@
+from core.startup import timer
+import argparse
 import tkinter as tk
 import logging
+import threading
 from gui.login import LoginScreen
 from gui.camera_frame import CameraFrame
 from gui.user_status import UserStatusFrame
 from core.constants import *
 from core.attendance_logging import cleanup_old_logs
+from core.attendance_store import get_store
+from core.attendance_archive import archive_closed_sessions
+from core.attendance_sink import flush_attendance
+from core.metrics import MetricsWriter, metrics_file
+
+timer.mark("imports done")
+
+def startup_maintenance():
+    # Migration, retention and archiving touch disk only; none of it needs to finish before the window shows.
+    try:
+        with timer.stage("migrate csv logs"):
+            get_store().migrate_csv_logs(ATTENDANCE_DIR)
+        with timer.stage("cleanup old logs"):
+            cleanup_old_logs(ATTENDANCE_DIR)
+        with timer.stage("archive closed sessions"):
+            archive_closed_sessions()
+    except Exception as e:
+        logging.error(f"Startup maintenance failed: {e}")
 
 class AttendanceApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, startup_timing=False):
         super().__init__()
         self.title("AI Attendance System - Face Recognition")
         self.geometry("980x540")
         self.configure(bg="#181C1F")
-        cleanup_old_logs(ATTENDANCE_DIR)
+        self.startup_timing = startup_timing
+        threading.Thread(target=startup_maintenance, daemon=True, name="startup-maintenance").start()
+        if metrics_file():
+            MetricsWriter(metrics_file()).start()
         menubar = tk.Menu(self)
         tools_menu = tk.Menu(menubar, tearoff=0)
         tools_menu.add_command(label="Refresh Admin Dashboard Page", command=self.refresh_current_page)
@@ -29,10 +53,16 @@ class AttendanceApp(tk.Tk):
         right_frame.pack(side=tk.LEFT, fill=tk.BOTH, padx=(6,18), pady=10)
         right_frame.pack_propagate(False)
 
-        self.camera_frame = CameraFrame(right_frame, width=540, height=400)
+        self.camera_frame = CameraFrame(right_frame, width=540, height=400, on_ready=self.on_models_ready)
         self.camera_frame.pack(pady=(10,8))
         self.status_frame = UserStatusFrame(right_frame, width=540, height=80)
         self.status_frame.pack(pady=(8,10))
+        self.after_idle(lambda: timer.mark("first paint"))
+
+    def on_models_ready(self):
+        timer.mark("models ready")
+        if self.startup_timing:
+            print(timer.report())
 
     def refresh_current_page(self):
         if self.admin_dashboard_instance and hasattr(self.admin_dashboard_instance, "current_page") and self.admin_dashboard_instance.current_page:
@@ -66,10 +96,15 @@ class AttendanceApp(tk.Tk):
         self.destroy()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI Attendance System")
+    parser.add_argument("--startup-timing", action="store_true", help="Print how long each startup stage took once the face models are ready")
+    args = parser.parse_args()
     try:
-        app = AttendanceApp()
+        app = AttendanceApp(startup_timing=args.startup_timing)
         app.protocol("WM_DELETE_WINDOW", app.on_closing)
         app.mainloop()
     except Exception as e:
         logging.error(f"Application error: {e}")
-        print(f"Application failed to start: {e}")
\ No newline at end of file
+        print(f"Application failed to start: {e}")
+    finally:
+        flush_attendance()
\ No newline at end of file
@@ -0,0 +1,37 @@
+import argparse
+import logging
+from core.constants import *
+from core.attendance_logging import cleanup_old_logs
+from core.attendance_store import get_store
+from core.attendance_sink import flush_attendance
+from core.cameras import parse_source
+from core.service import RecognitionService, serve
+from core.metrics import MetricsWriter, metrics_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Run face recognition attendance without the GUI and expose a local HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--source", type=parse_source, action="append", default=[], help="Camera index, video file, RTSP URL or image folder to read frames from; repeat for several cameras, omit to accept frames over the API only")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    get_store().migrate_csv_logs(ATTENDANCE_DIR)
+    cleanup_old_logs(ATTENDANCE_DIR)
+    service = RecognitionService(args.source)
+    server = serve(service, args.host, args.port)
+    service.start()
+    if metrics_file():
+        MetricsWriter(metrics_file()).start()
+    logging.info(f"Recognition service listening on http://{args.host}:{args.port} (session {service.session})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        flush_attendance()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The app uses paths relative to the project root (admin_system_data/...), so tests run from there too.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,37 @@
+import threading
+import numpy as np
+
+class FakeRecognizer:
+    def __init__(self, threshold=0.2):
+        self.threshold = threshold
+        self.path = None
+
+class FakeEmbedder:
+    def __init__(self):
+        self.cropped = 0
+
+    def crop_faces(self, frame, boxes, landmarks=None):
+        self.cropped += len(boxes)
+        return [np.zeros((4, 4, 3), dtype=np.uint8) for _ in boxes]
+
+class FakeModels:
+    # Stands in for RecognitionModels: every crop is recognized as `label` with probability `prob`.
+    def __init__(self, label="2262701242001", prob=0.4, threshold=0.2):
+        self.lock = threading.RLock()
+        self.recognizer = FakeRecognizer(threshold)
+        self.embedder = FakeEmbedder()
+        self.label = label
+        self.prob = prob
+
+    def classify(self, crops):
+        return [(self.label, self.prob)] * len(crops)
+
+def run_frames(engine, models, box, frames):
+    # Feeds the same face box through begin/finish, as the batch scheduler does, and returns crops per frame.
+    crops_per_frame = []
+    boxes = np.array([box])
+    for _ in range(frames):
+        tracks, pending, crops = engine.begin(None, boxes, None)
+        crops_per_frame.append(len(crops))
+        engine.finish(boxes, tracks, pending, models.classify(crops))
+    return crops_per_frame
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+import pytest
+from core import attendance_stats
+from core.admin_backend import AdminBackend
+from core.attendance_store import AttendanceStore, use_store
+from core.timetable import CompiledTimetable, read_timetable_rows
+from core.constants import TIMETABLE_DIR
+
+STUDENT = {"PRN": "2262701242001", "Name": "sakshi", "Class": "Third year", "Division": "Diamond", "Batch": "B-3"}
+
+@pytest.fixture
+def store(tmp_path):
+    store = AttendanceStore(str(tmp_path / "attendance.db"))
+    use_store(store)
+    yield store
+    use_store(None)
+
+@pytest.fixture
+def shipped_timetable(monkeypatch):
+    timetable = CompiledTimetable(read_timetable_rows(TIMETABLE_DIR))
+    monkeypatch.setattr(attendance_stats, "get_timetable", lambda: timetable)
+    monkeypatch.setattr(AdminBackend, "get_students", staticmethod(lambda: [STUDENT]))
+    return timetable
+
+def test_shipped_timetable_counts_only_lectures(shipped_timetable):
+    subjects = shipped_timetable.weekly_subjects("Diamond", "B-3")
+    assert subjects
+    for subject in subjects:
+        lowered = subject.lower()
+        assert "break" not in lowered and "homework" not in lowered and lowered.strip() != "nan"
+        assert not lowered.startswith("prof.")
+    # Sunday only has homework rows; nothing there should count as a lecture.
+    assert all(6 not in days for days in subjects.values())
+
+def test_summary_on_shipped_timetable(store, shipped_timetable):
+    # Present at every Machine Learning Lab in September 2025, absent otherwise.
+    lab_days = shipped_timetable.weekly_subjects("Diamond", "B-3")["Machine Learning Lab"]
+    rows = []
+    day = date(2025, 9, 1)
+    while day <= date(2025, 9, 30):
+        if day.weekday() in lab_days:
+            rows.append(("s", {"PRN": STUDENT["PRN"], "Student Name": STUDENT["Name"], "Date": day.isoformat(), "Subject": "Machine Learning Lab"}))
+        day += timedelta(days=1)
+    store.insert_batch(rows)
+
+    summary = attendance_stats.attendance_summary("2025-09-01", "2025-09-30")
+    by_subject = {r["Subject"]: r for r in summary}
+    assert by_subject["Machine Learning Lab"]["Percentage"] == 100.0
+    assert by_subject["Machine Learning Lab"]["Total"] == len(rows)
+    assert not any("break" in s.lower() or "homework" in s.lower() for s in by_subject)
+    assert 0.0 < attendance_stats.overall_percentage(summary) < 100.0
+    defaulters = attendance_stats.find_defaulters(summary, 75)
+    assert "Machine Learning Lab" not in {r["Subject"] for r in defaulters}
+
+def test_aggregates_rebuilt_once_per_database(tmp_path, monkeypatch):
+    path = str(tmp_path / "attendance.db")
+    AttendanceStore(path).conn.close()
+    calls = []
+    monkeypatch.setattr(AttendanceStore, "rebuild_aggregates", lambda self: calls.append(self))
+    AttendanceStore(path).conn.close()
+    assert calls == []
+
+def test_presence_counts_only_days_in_range(store):
+    # Present every day of September 2025 (2025-09-01 is a Monday).
+    days = [date(2025, 9, 1) + timedelta(days=i) for i in range(30)]
+    store.insert_batch([("s", {"PRN": STUDENT["PRN"], "Date": d.isoformat(), "Subject": "Machine Learning Lab"}) for d in days])
+    key = (STUDENT["PRN"], "Machine Learning Lab")
+    assert store.presence_totals("2025-09-01", "2025-09-02") == {key: 2}
+    for start in range(0, 30, 3):
+        for end in range(start, 30, 4):
+            totals = store.presence_totals(days[start].isoformat(), days[end].isoformat())
+            assert totals.get(key, 0) == end - start + 1
+    assert store.presence_totals()[key] == 30
+    assert store.presence_totals(to_date="2025-09-10")[key] == 10
+    assert store.presence_totals(from_date="2025-09-10")[key] == 21
+
+def test_short_range_summary_counts_only_days_in_range(store, shipped_timetable):
+    # Present at every Machine Learning Lab of the week of 2025-09-01; the summary for part of that week
+    # must not pick up the labs attended later in the week.
+    lab_days = shipped_timetable.weekly_subjects("Diamond", "B-3")["Machine Learning Lab"]
+    days = [date(2025, 9, 1) + timedelta(days=i) for i in range(7) if i in lab_days]
+    store.insert_batch([("s", {"PRN": STUDENT["PRN"], "Date": d.isoformat(), "Subject": "Machine Learning Lab"}) for d in days])
+    to_date = days[0].isoformat()
+    summary = attendance_stats.attendance_summary("2025-09-01", to_date)
+    lab = next(r for r in summary if r["Subject"] == "Machine Learning Lab")
+    assert lab["Present"] == lab["Total"] == 1
+    assert lab["Percentage"] == 100.0
+
+def test_empty_percentage_export_keeps_existing_file(store, shipped_timetable, tmp_path):
+    path = tmp_path / "percentages.csv"
+    path.write_text("previous export\n", encoding="utf-8")
+    assert attendance_stats.export_summary(str(path), "no such subject", "2025-09-01", "2025-09-30") == 0
+    assert path.read_text(encoding="utf-8") == "previous export\n"
+    assert attendance_stats.export_summary(str(path), "machine learning", "2025-09-01", "2025-09-30") > 0
+    assert path.read_text(encoding="utf-8").startswith("PRN,")
+    assert not (tmp_path / "percentages.csv.tmp").exists()
@@ -0,0 +1,50 @@
+import pickle
+import numpy as np
+from core import dataset_index
+
+def make_dataset(tmp_path):
+    root = tmp_path / "dataset"
+    for label, names in {"2262701242001": ["a.jpeg", "b.jpeg"], "2262701242034": ["c.jpg"]}.items():
+        (root / label).mkdir(parents=True)
+        for name in names:
+            (root / label / name).write_bytes(name.encode())
+    return root
+
+def write_legacy_cache(path, keys):
+    # The shipped cache: (Windows path of a processed crop, md5 of the crop) -> embedding.
+    data = {(key, f"md5-{i}"): np.full(4, i, dtype=np.float32) for i, key in enumerate(keys)}
+    with open(path, "wb") as f:
+        pickle.dump(data, f)
+
+def test_legacy_cache_keys_are_normalised(tmp_path):
+    cache = tmp_path / "embedding_cache.pkl"
+    write_legacy_cache(cache, ["admin_system_data\\processed_dataset\\2262701242001\\a_face0.jpg"])
+    entries = dataset_index.load_cache(str(cache))["entries"]
+    assert list(entries) == ["2262701242001/a_face0.jpg"]
+    assert entries["2262701242001/a_face0.jpg"]["label"] == "2262701242001"
+
+def test_legacy_embeddings_are_not_mixed_with_current_ones(tmp_path):
+    root = make_dataset(tmp_path)
+    cache = tmp_path / "embedding_cache.pkl"
+    # Same md5 as a dataset image, but produced by the old embedding pipeline.
+    with open(cache, "wb") as f:
+        pickle.dump({("admin_system_data\\dataset\\2262701242001\\a.jpeg", dataset_index.file_md5(root / "2262701242001" / "a.jpeg")): np.zeros(4)}, f)
+    embedded = []
+    def embed_files(paths):
+        embedded.extend(paths)
+        return {p: np.ones(4) for p in paths}
+    entries, missing = dataset_index.sync_embeddings(str(root), str(cache), embed_files=embed_files)
+    assert missing == 3 and len(embedded) == 3
+    assert all(e["embedding"][0] == 1 for e in entries.values())
+    assert sorted(entries) == ["2262701242001/a.jpeg", "2262701242001/b.jpeg", "2262701242034/c.jpg"]
+    # The migrated cache is saved in the current format, so the next sync only stats files.
+    assert dataset_index.load_cache(str(cache))["version"] == dataset_index.CACHE_VERSION
+    assert dataset_index.sync_embeddings(str(root), str(cache), embed_files=lambda paths: {})[1] == 0
+
+def test_first_rebuild_keeps_shipped_artifact(tmp_path):
+    path = tmp_path / "arcface_embeddings.npz"
+    path.write_bytes(b"shipped")
+    assert dataset_index.keep_original(str(path)) == f"{path}.orig"
+    path.write_bytes(b"rebuilt")
+    assert dataset_index.keep_original(str(path)) is None
+    assert (tmp_path / "arcface_embeddings.npz.orig").read_bytes() == b"shipped"
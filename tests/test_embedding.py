@@ -0,0 +1,6 @@
+from core.embedding import spatial_size
+
+def test_spatial_size_accepts_client_and_keras_shapes():
+    assert spatial_size((112, 112)) == (112, 112)
+    assert spatial_size((112, 96, 3)) == (112, 96)
+    assert spatial_size((None, 112, 96, 3)) == (112, 96)
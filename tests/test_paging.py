@@ -0,0 +1,31 @@
+import csv
+from core.paging import CsvFileSource
+
+HEADERS = ["Timestamp", "Action", "Detail"]
+
+def write_log(path, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if mode == "w":
+            writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+def test_records_with_embedded_newlines_page_as_one_row(tmp_path):
+    path = tmp_path / "system_logs.csv"
+    rows = [["2025-09-01 10:00:00", "Login", "admin"],
+            ["2025-09-01 10:01:00", "Bulk Import", 'failed:\nrow 3 "PRN" missing\nrow 7'],
+            ["2025-09-01 10:02:00", "Logout", "admin"]]
+    write_log(path, rows)
+    source = CsvFileSource(str(path), HEADERS)
+    assert source.count() == 3
+    assert [list(r.values()) for r in source.fetch(0, 10)] == rows
+    assert source.fetch(2, 1)[0]["Action"] == "Logout"
+    assert source.count("row 7") == 1
+
+def test_appended_records_are_indexed_incrementally(tmp_path):
+    path = tmp_path / "system_logs.csv"
+    write_log(path, [["2025-09-01 10:00:00", "Login", "line one\nline two"]])
+    source = CsvFileSource(str(path), HEADERS)
+    assert source.count() == 1
+    write_log(path, [["2025-09-01 10:05:00", "Backup", "done"]], mode="a")
+    assert [r["Action"] for r in source.fetch(0, 10, descending=True)] == ["Backup", "Login"]
@@ -0,0 +1,30 @@
+import numpy as np
+from core.recognizers import EmbeddingIndex, l2_normalize
+
+def gallery(n=400, dim=16, identities=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(identities, dim))
+    labels = rng.integers(identities, size=n)
+    return centers[labels] + 0.05 * rng.normal(size=(n, dim)), [f"id{l}" for l in labels], centers
+
+def test_ivf_search_matches_exhaustive_search():
+    X, y, centers = gallery()
+    exact = EmbeddingIndex(X, y)
+    ivf = EmbeddingIndex(X, y, ivf_min_size=100, nprobe=4)
+    assert ivf.centroids is not None
+    assert sum(len(rows) for rows in ivf.lists) == len(X)
+    assert ivf.predict(centers)[0] == exact.predict(centers)[0]
+    # Rows added after the lists were built are searchable too.
+    ivf.add("late", centers[:1] * -1)
+    assert ivf.predict(centers[:1] * -1)[0] == ["late"]
+
+def test_ivf_falls_back_when_probed_lists_are_empty():
+    X, y, centers = gallery()
+    index = EmbeddingIndex(X, y, ivf_min_size=100, nprobe=1)
+    # A centroid with no members that the query probes first.
+    query = l2_normalize(centers[:1])
+    index.centroids = np.vstack([index.centroids, query])
+    index.lists.append(np.zeros(0, dtype=int))
+    rows, scores = index.search(query)
+    assert rows[0] >= 0 and scores[0] > 0.9
+    assert index.predict(query)[0] == EmbeddingIndex(X, y).predict(query)[0]
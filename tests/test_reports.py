@@ -0,0 +1,28 @@
+from core.reports import write_report
+
+def rows(n):
+    return ({"PRN": str(i), "Student Name": f"s{i}", "Date": "2025-09-01"} for i in range(n))
+
+def test_write_report_replaces_file_on_success(tmp_path):
+    path = tmp_path / "report.csv"
+    assert write_report(str(path), rows(3)) == 3
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+    assert not (tmp_path / "report.csv.tmp").exists()
+
+def test_cancelled_report_leaves_no_partial_file(tmp_path):
+    path = tmp_path / "report.csv"
+    assert write_report(str(path), rows(2000), cancelled=lambda: True, every=500) is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_cancelled_report_keeps_existing_file(tmp_path):
+    path = tmp_path / "report.csv"
+    path.write_text("previous export\n", encoding="utf-8")
+    write_report(str(path), rows(2000), cancelled=lambda: True, every=500)
+    assert path.read_text(encoding="utf-8") == "previous export\n"
+
+def test_empty_report_keeps_existing_file(tmp_path):
+    path = tmp_path / "report.csv"
+    path.write_text("previous export\n", encoding="utf-8")
+    assert write_report(str(path), rows(0)) == 0
+    assert path.read_text(encoding="utf-8") == "previous export\n"
+    assert not (tmp_path / "report.csv.tmp").exists()
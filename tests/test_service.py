@@ -0,0 +1,39 @@
+import json
+import threading
+from http.client import HTTPConnection
+import pytest
+from core.service import serve
+
+class FakeService:
+    session = "test_session"
+
+    def status(self):
+        return {"status": "ok"}
+
+    def get_roster(self):
+        return [{"PRN": "2262701242001"}]
+
+@pytest.fixture
+def server():
+    server = serve(FakeService(), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, path, method="GET"):
+    conn = HTTPConnection(*server.server_address)
+    conn.request(method, path)
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    conn.close()
+    return response.status, body
+
+def test_routes_ignore_query_strings(server):
+    assert get(server, "/health?probe=1") == (200, {"status": "ok"})
+    assert get(server, "/roster?fresh=1")[1]["session"] == "test_session"
+    assert get(server, "/missing?x=1")[0] == 404
+
+def test_post_routes_ignore_query_strings(server):
+    # Routed to /frames, so an empty body is rejected rather than reported as not found.
+    assert get(server, "/frames?camera=1", method="POST")[0] == 400
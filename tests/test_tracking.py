@@ -0,0 +1,50 @@
+from datetime import timedelta
+from core.recognition import RecognitionEngine
+from fakes import FakeModels, run_frames
+
+def make_engine(models, **kwargs):
+    engine = RecognitionEngine("test_session", face_confirm_count=5, time_window=timedelta(minutes=2), models=models, **kwargs)
+    engine.logged = []
+    engine.log = lambda key, now: engine.logged.append(key)
+    return engine
+
+def test_confirmed_track_at_typical_confidence_is_not_reembedded_between_reverifies():
+    models = FakeModels(prob=0.4, threshold=0.2)
+    engine = make_engine(models, reverify_every=30)
+    crops = run_frames(engine, models, (10, 10, 60, 60), 5 + 60)
+    # Five verifications to confirm, then one re-verify every 30 tracked frames.
+    assert crops[:5] == [1] * 5
+    assert engine.tracker.tracks[0].confirmed
+    assert crops[5:] == ([0] * 29 + [1]) * 2
+    assert engine.logged == ["2262701242001"]
+
+def test_explicit_reverify_cutoff_still_applies():
+    models = FakeModels(prob=0.4, threshold=0.2)
+    engine = make_engine(models, reverify_confidence=0.5)
+    crops = run_frames(engine, models, (10, 10, 60, 60), 10)
+    assert crops == [1] * 10
+
+def test_track_staying_in_view_is_relogged_after_log_interval():
+    models = FakeModels(prob=0.4, threshold=0.2)
+    engine = make_engine(models, reverify_every=30)
+    clock = [1000.0]
+    engine.identities.clock = lambda: clock[0]
+
+    # Detection runs at about 5 fps once the motion gate backs off, so re-verifications are 6 s apart.
+    def frames(n, fps=5):
+        crops = []
+        for _ in range(n):
+            crops += run_frames(engine, models, (10, 10, 60, 60), 1)
+            clock[0] += 1.0 / fps
+        return crops
+
+    frames(5)
+    assert engine.logged == ["2262701242001"]
+    # Same track, still in view: no second log inside the two-minute interval...
+    frames(5 * 110)
+    assert engine.logged == ["2262701242001"]
+    assert len(engine.tracker.tracks) == 1
+    # ...and one more once it has passed, without the track being re-embedded every frame.
+    crops = frames(5 * 15)
+    assert engine.logged == ["2262701242001"] * 2
+    assert sum(crops) <= len(crops) // 30 + 1